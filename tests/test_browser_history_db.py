@@ -0,0 +1,219 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "urlstashgui")
+)
+
+try:
+    from firefox_history_gui import UrlStashGUI
+except ImportError as e:  # customtkinter / stashapi not installed
+    UrlStashGUI = None
+    IMPORT_ERROR = e
+
+
+def make_app(history_db_path):
+    """Build a UrlStashGUI with just the state the history DB methods use."""
+    app = UrlStashGUI.__new__(UrlStashGUI)
+    app.history_db_path = history_db_path
+    app._history_conn = None
+    app._history_conn_lock = threading.Lock()
+    app._browser_url_cache = {}
+    app._browser_url_cache_epoch = 0
+    app._write_conn = None
+    app._write_lock = threading.RLock()
+    app._history_sync_lock = threading.Lock()
+    app.url_filters = []
+    app.url_replacements = []
+    return app
+
+
+@unittest.skipIf(UrlStashGUI is None, "GUI dependencies are not installed")
+class AppendToBrowserHistoryDbTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.app = make_app(os.path.join(self.tmpdir.name, "browserHistory.db"))
+
+    def tearDown(self):
+        self.app._close_write_conn()
+        self.app._close_history_conn()
+        self.tmpdir.cleanup()
+
+    def _make_source_db(self, table_name, rows):
+        path = os.path.join(self.tmpdir.name, "temp_processing_browserHistory.db")
+        conn = sqlite3.connect(path)
+        conn.execute(f'CREATE TABLE "{table_name}" (id INTEGER PRIMARY KEY, url TEXT, title TEXT)')
+        conn.executemany(f'INSERT INTO "{table_name}" (url, title) VALUES (?, ?)', rows)
+        conn.commit()
+        conn.close()
+        return path
+
+    def test_imports_rows_from_temp_db(self):
+        temp_db_path = self._make_source_db(
+            "moz_places",
+            [
+                ("https://example.com/a", "Scene A"),
+                ("https://example.com/b", "Scene B"),
+                ("https://example.com/a", "Scene A again"),
+                ("", "No URL"),
+            ],
+        )
+
+        appended = self.app.append_to_browser_history_db(
+            temp_db_path, "moz_places", "places.sqlite::moz_places", "/profile/places.sqlite"
+        )
+
+        self.assertEqual(appended, 2)
+        # The temp copy must not stay attached, or it could not be deleted.
+        attached = [row[1] for row in self.app._write_conn.execute("PRAGMA database_list")]
+        self.assertNotIn("src", attached)
+        os.remove(temp_db_path)
+
+        conn = sqlite3.connect(self.app.history_db_path)
+        rows = conn.execute(
+            "SELECT url, title, source_file FROM browser_hist ORDER BY url"
+        ).fetchall()
+        conn.close()
+        self.assertEqual(
+            rows,
+            [
+                ("https://example.com/a", "Scene A", "places.sqlite"),
+                ("https://example.com/b", "Scene B", "places.sqlite"),
+            ],
+        )
+
+    def test_second_import_skips_known_urls(self):
+        temp_db_path = self._make_source_db("moz places", [("https://example.com/a", "Scene A")])
+        args = (temp_db_path, "moz places", "places.sqlite::moz places", "places.sqlite")
+
+        self.assertEqual(self.app.append_to_browser_history_db(*args), 1)
+        self.assertEqual(self.app.append_to_browser_history_db(*args), 0)
+
+
+@unittest.skipIf(UrlStashGUI is None, "GUI dependencies are not installed")
+class BrowserUrlCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.app = make_app(os.path.join(self.tmpdir.name, "browserHistory.db"))
+        conn = sqlite3.connect(self.app.history_db_path)
+        conn.execute(
+            "CREATE TABLE browser_hist (id INTEGER PRIMARY KEY, url TEXT UNIQUE, title TEXT, "
+            "browser TEXT, historytitle TEXT, source_file TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO browser_hist (url, title, historytitle) VALUES (?, ?, ?)",
+            ("https://example.com/a", "Scene A", "scenea"),
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.app._close_history_conn()
+        self.tmpdir.cleanup()
+
+    def test_lookup_is_memoized(self):
+        candidates = self.app.get_browser_urls("Scene A", get_all=True)
+
+        self.assertEqual(candidates, [("scenea", "https://example.com/a")])
+        self.assertIn(("scenea", True), self.app._browser_url_cache)
+
+    def test_lookup_straddling_a_clear_is_not_stored(self):
+        filter_domains = self.app._browser_url_filter_domains
+
+        def clear_mid_lookup():
+            # A sync closing the lookup connection after the lookup started
+            self.app._close_history_conn()
+            return filter_domains()
+
+        self.app._browser_url_filter_domains = clear_mid_lookup
+        self.app.get_browser_urls("Scene A", get_all=True)
+        self.app.prefetch_browser_urls(["Scene A"])
+
+        self.assertEqual(self.app._browser_url_cache, {})
+
+    def test_resolver_retries_after_a_mid_run_clear(self):
+        app = self.app
+        app._candidate_generation = 1
+        applied = []
+        app.after = lambda delay, callback, *args: applied.append(args)
+        prefetch = app.prefetch_browser_urls
+        prefetch_calls = []
+
+        def prefetch_then_sync(base_filenames):
+            prefetch(base_filenames)
+            prefetch_calls.append(True)
+            if len(prefetch_calls) == 1:
+                app._close_history_conn()
+
+        app.prefetch_browser_urls = prefetch_then_sync
+        scene = {"id": "1", "title": "", "files": [{"path": "/media/Scene A.mp4"}]}
+        app._resolve_candidates_thread(1, [scene])
+
+        self.assertEqual(len(prefetch_calls), 2)
+        generation, resolved = applied[0]
+        self.assertEqual(generation, 1)
+        self.assertEqual(len(resolved), 1)
+        self.assertIn(("scenea", True), app._browser_url_cache)
+
+    def test_resolver_finishes_when_lookups_fail(self):
+        app = self.app
+        conn = sqlite3.connect(app.history_db_path)
+        conn.execute("DROP TABLE browser_hist")
+        conn.commit()
+        conn.close()
+        app._candidate_generation = 1
+        applied = []
+        app.after = lambda delay, callback, *args: applied.append(args)
+        prefetch = app.prefetch_browser_urls
+        prefetch_calls = []
+
+        def counting_prefetch(base_filenames):
+            prefetch_calls.append(True)
+            prefetch(base_filenames)
+
+        app.prefetch_browser_urls = counting_prefetch
+        scene = {"id": "1", "title": "", "files": [{"path": "/media/Scene A.mp4"}]}
+        app._resolve_candidates_thread(1, [scene])
+
+        self.assertEqual(len(prefetch_calls), 1)
+        self.assertEqual(len(applied), 1)
+        self.assertEqual(app._browser_url_cache_epoch, 0)
+
+
+@unittest.skipIf(UrlStashGUI is None, "GUI dependencies are not installed")
+class DeferredAcceptTest(unittest.TestCase):
+    def test_accepts_while_rows_pending_queue_once(self):
+        app = make_app(os.path.join(tempfile.gettempdir(), "browserHistory.db"))
+        app.accept_in_progress = False
+        app.connection_dependent_buttons = []
+        app._candidates_pending = True
+        scheduled = []
+        app.after = lambda delay, callback, *args: scheduled.append(callback)
+
+        # Button clicks plus the auto-accept timer while rows are resolving
+        app.accept_candidates()
+        app.accept_candidates()
+        app.accept_candidates()
+
+        self.assertEqual(len(scheduled), 1)
+        self.assertTrue(app.accept_in_progress)
+
+
+@unittest.skipIf(UrlStashGUI is None, "GUI dependencies are not installed")
+class HistorySyncGuardTest(unittest.TestCase):
+    def test_second_sync_is_refused_until_first_ends(self):
+        app = make_app(os.path.join(tempfile.gettempdir(), "browserHistory.db"))
+
+        self.assertTrue(app._begin_history_sync())
+        self.assertFalse(app._begin_history_sync())
+        app._end_history_sync()
+        self.assertTrue(app._begin_history_sync())
+        app._end_history_sync()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,26 +4,133 @@ import re
 import sqlite3
 import shutil
 import threading
-import time
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 import customtkinter as ctk
 from tkinter import ttk, messagebox, filedialog
 import tkinter as tk  # Still needed for some specific widgets
+import tkinter.font as tkFont
 
 from stashapi.stashapp import StashInterface
 from logger_setup import TextHandler, setup_logger
-from utils import sanitize_for_windows, remove_dash_number_suffix
+from utils import sanitize_for_windows, clean_filename, scene_file_stem
 
 # Set CustomTkinter appearance
 ctk.set_appearance_mode("system")  # "light", "dark", or "system"
 ctk.set_default_color_theme("blue")  # "blue", "green", or "dark-blue"
 
 TARGET_SCENE_COUNT = 10
+# Scenes requested per find_scenes page while scanning for matches
+SCENE_BATCH_SIZE = 100
+# findScene lookups merged into one aliased GraphQL request
+FIND_SCENE_ALIAS_BATCH = 25
+# Concurrent Stash requests and rows fetched ahead during side DB sync
+STASH_FETCH_WORKERS = 8
+SYNC_PREFETCH_WINDOW = 64
 LOG_FILE_NAME = "urlstashgui.log"
+BROWSER_HISTORY_DB_NAME = "browserHistory.db"
 logger = setup_logger("UrlStashGUI", LOG_FILE_NAME)
 
+# Candidate lookup against the merged browser history. Kept as a constant so the
+# sqlite3 statement cache reuses the prepared statement across calls.
+BROWSER_URLS_SQL = """
+    SELECT historytitle, url
+    FROM browser_hist
+    WHERE historytitle LIKE ? COLLATE NOCASE
+      AND LENGTH(historytitle) >= LENGTH(?)
+      AND historytitle IS NOT NULL AND historytitle != ''
+      AND url IS NOT NULL AND url != ''
+"""
+# One clause per URL filter domain, appended to BROWSER_URLS_SQL.
+BROWSER_URLS_DOMAIN_CLAUSE = " AND url NOT LIKE ? ESCAPE '\\'"
+# Keep the primary candidate the earliest-inserted match, as with a table scan.
+BROWSER_URLS_ORDER = " ORDER BY id"
+# Same lookup for a JSON array of cleaned filenames at once. LIKE cannot use the
+# index with a per-row pattern, so the NOCASE range bounds do the seeking and
+# LIKE only re-checks the rows in range.
+BROWSER_URLS_BATCH_SQL = """
+    SELECT q.value, h.historytitle, h.url
+    FROM json_each(?) AS q
+    JOIN browser_hist AS h
+      ON h.historytitle COLLATE NOCASE >= q.value
+     AND h.historytitle COLLATE NOCASE < q.value || char(1114111)
+    WHERE h.historytitle LIKE q.value || '%'
+      AND h.historytitle != ''
+      AND url IS NOT NULL AND url != ''
+"""
+BROWSER_URLS_BATCH_ORDER = " ORDER BY q.key, h.id"
+# NOCASE index on historytitle lets the candidate prefix LIKE run as a range search
+HISTORYTITLE_INDEX_NAME = "idx_browser_hist_historytitle"
+HISTORYTITLE_INDEX_SQL = (
+    f"CREATE INDEX IF NOT EXISTS {HISTORYTITLE_INDEX_NAME} "
+    "ON browser_hist(historytitle COLLATE NOCASE)"
+)
+# Memoized candidate lookups kept before the memo is reset
+BROWSER_URL_CACHE_MAX = 4096
+# The "(N) " hit-count prefix shown before a candidate URL on the Scenes page
+HIT_COUNT_PREFIX_RE = re.compile(r"^\(\d+\)\s+")
+# The scan-progress line written after each scene, read back to resume scans
+LOADED_SCENE_RE = re.compile(rb"Loaded scene (\d+)")
+
+
+def _sanitize_history_title(title_val):
+    """SQL function body: the historytitle value stored for a raw page title."""
+    return sanitize_for_windows(str(title_val)) if title_val else ""
+
+
+def _escape_like(text):
+    """Escape LIKE wildcards so the text is matched literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@lru_cache(maxsize=16)
+def _compile_domain_filter(filter_domains, batch=False):
+    """Build the candidate query and LIKE parameters for a tuple of filter domains."""
+    domain_params = tuple(
+        f"%{_escape_like(d.strip())}%" for d in filter_domains if d.strip()
+    )
+    if batch:
+        base_sql, order_sql = BROWSER_URLS_BATCH_SQL, BROWSER_URLS_BATCH_ORDER
+    else:
+        base_sql, order_sql = BROWSER_URLS_SQL, BROWSER_URLS_ORDER
+    sql_query = base_sql + BROWSER_URLS_DOMAIN_CLAUSE * len(domain_params) + order_sql
+    return sql_query, domain_params
+
+
+def _lookup_candidates(conn, clean_base, filter_domains, get_all=False):
+    """Return (historytitle, url) rows in browser_hist matching a cleaned filename.
+
+    historytitle is stored already sanitized (lowercase alphanumerics), so the
+    prefix LIKE plus the empty/domain predicates leave only usable matches.
+    Only the first match is fetched unless ``get_all`` is set.
+    """
+    sql_query, domain_params = _compile_domain_filter(tuple(filter_domains))
+    cursor = conn.execute(sql_query, (clean_base + "%", clean_base, *domain_params))
+    if get_all:
+        return cursor.fetchall()
+    first_row = cursor.fetchone()
+    cursor.close()
+    return [first_row] if first_row else []
+
+
+def _lookup_candidates_many(conn, clean_bases, filter_domains):
+    """Return {clean_base: rows} for several cleaned filenames in one query.
+
+    Each list holds the rows ``_lookup_candidates(..., get_all=True)`` would
+    return for that filename, in the same order.
+    """
+    sql_query, domain_params = _compile_domain_filter(tuple(filter_domains), batch=True)
+    candidates = {clean_base: [] for clean_base in clean_bases}
+    for clean_base, historytitle, url in conn.execute(
+        sql_query, (json.dumps(clean_bases), *domain_params)
+    ):
+        candidates[clean_base].append((historytitle, url))
+    return candidates
+
 
 class ToolTip:
     """Simple tooltip class for CTkLabel widgets"""
@@ -92,6 +199,31 @@ class ToolTip:
         self.text = new_text
 
 
+@dataclass
+class SceneRow:
+    """Widgets making up one row of the Scenes page."""
+
+    frame: ctk.CTkFrame
+    checkbox_var: tk.BooleanVar
+    scene_label: ctk.CTkLabel
+    diff_label: ctk.CTkLabel
+    url_label: ctk.CTkLabel
+    tooltip: ToolTip
+    # Text last written to each label, so unchanged refreshes skip Tcl calls
+    drawn_text: dict = field(default_factory=dict)
+
+    def set_text(self, label_name, text):
+        if self.drawn_text.get(label_name) == text:
+            return
+        getattr(self, label_name).configure(text=text)
+        self.drawn_text[label_name] = text
+
+    def set_checked(self, checked):
+        # Setting the variable redraws the checkbox even when nothing changed.
+        if self.checkbox_var.get() != checked:
+            self.checkbox_var.set(checked)
+
+
 class UrlStashGUI(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -145,13 +277,39 @@ class UrlStashGUI(ctk.CTk):
         self.all_checked = False
         self.scenes = []
 
+        # Merged history DB, resolved once against the startup working directory
+        self.history_db_path = os.path.abspath(BROWSER_HISTORY_DB_NAME)
+        # Shared read-only connection for browser history lookups
+        self._history_conn = None
+        self._history_conn_lock = threading.Lock()
+        # Candidate lookups memoized per (clean_base, get_all) until the history
+        # DB is rewritten or the URL filters change. The epoch counts clears so
+        # a lookup that straddles one does not store its stale result.
+        self._browser_url_cache = {}
+        self._browser_url_cache_epoch = 0
+        # Writable browserHistory.db connection shared by the sync/clean steps.
+        # Every use holds _write_lock; only one sync runs at a time.
+        self._write_conn = None
+        self._write_lock = threading.RLock()
+        self._history_sync_lock = threading.Lock()
+        # Stash client reused until the connection settings change
+        self.stash = None
+        self._stash_key = None
+        self._stash_lock = threading.Lock()
+        # 'URLHistory' tag ID, looked up once per Stash client
+        self._urlhistory_tag_id = None
+        self._urlhistory_tag_stash = None
+        self._urlhistory_tag_lock = threading.Lock()
+
         # Track Stash connectivity and dependent button state
         self.stash_connected = False
         self.accept_in_progress = False
         self.connection_dependent_buttons = []
 
         self.scene_url_candidates = []  # Store all URL candidates for tooltips
-        self.url_tooltips = []  # Store tooltip objects
+        # Bumped per Scenes refresh so late background candidate lookups are dropped
+        self._candidate_generation = 0
+        self._candidates_pending = False
 
         # Session tracking for database sync
         self.synced_this_session = False
@@ -175,6 +333,16 @@ class UrlStashGUI(ctk.CTk):
         # Initialize scene ID
         self.initialize_scene_id()
 
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        """Release the shared history connections before closing the window."""
+        self._close_history_conn()
+        # A sync step still holding the write connection would freeze the window;
+        # leave the handle to process exit in that case.
+        self._close_write_conn(blocking=False)
+        self.destroy()
+
     def _get_runtime_base_dir(self):
         if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
             return sys._MEIPASS
@@ -241,11 +409,7 @@ class UrlStashGUI(ctk.CTk):
         self.threshold_var = tk.StringVar(value="3")
 
         # Scene row widgets
-        self.scene_row_frames = []
-        self.scene_num_labels = []
-        self.checkbox_vars = []
-        self.diff_labels = []
-        self.url_labels = []
+        self.scene_rows = []
 
     def create_sidebar(self):
         """Create sidebar navigation"""
@@ -618,81 +782,85 @@ class UrlStashGUI(ctk.CTk):
         self.middle_frame.bind("<Configure>", self._refresh_scene_canvas_scrollregion)
         self.middle_canvas.bind("<Configure>", self._resize_scene_canvas_window)
 
-        # Scene rows
-        self.scene_row_frames = []
-        self.scene_num_labels = []
-        self.checkbox_vars = []
-        self.diff_labels = []
-        self.url_labels = []
-        self.url_tooltips = []
-
-        import tkinter.font as tkFont
+        # Scene rows are built on demand by _get_scene_row as scenes are shown
+        self.scene_rows = []
 
         # Choose a fixed-width font so "60 chars" maps evenly to pixels
         font = tkFont.Font(family="Consolas", size=11)
 
         # Measure pixel width of 60 characters
-        px_for_60 = font.measure("0" * 60)
-        for i in range(TARGET_SCENE_COUNT):
-            # Create row frame with alternating background
-            row_color = ("#E8E8E8", "#E8E8E8") if i % 2 == 0 else ("#F5F5F5", "#F5F5F5")
-            row_frame = ctk.CTkFrame(
-                self.middle_frame, corner_radius=0, height=45, fg_color=row_color
-            )
-            row_frame.grid(row=i, column=0, sticky="ew", padx=0, pady=0)
-            row_frame.grid_propagate(False)
-
-            # Configure columns
-            row_frame.grid_columnconfigure(0, weight=0, minsize=50)  # Checkbox
-            row_frame.grid_columnconfigure(1, weight=0, minsize=100)  # Scene number
-            row_frame.grid_columnconfigure(2, weight=0, minsize=px_for_60)  # Diff info
-            row_frame.grid_columnconfigure(3, weight=1)  # URL
-
-            # Center content vertically
-            row_frame.grid_rowconfigure(0, weight=1)
-
-            # Checkbox
-            checkbox_var = tk.BooleanVar(value=True)
-            checkbox = ctk.CTkCheckBox(
-                row_frame, text="", variable=checkbox_var, width=30
-            )
-            checkbox.grid(row=0, column=0, padx=(15, 5), sticky="w")
+        self._scene_diff_column_px = font.measure("0" * 60)
+
+    def _get_scene_row(self, i):
+        """Return the widget row for scene slot ``i``, building rows up to it."""
+        while len(self.scene_rows) <= i:
+            self._build_scene_row(len(self.scene_rows))
+        return self.scene_rows[i]
+
+    def _build_scene_row(self, i):
+        """Create the widgets for scene slot ``i`` and append them to scene_rows."""
+        # Create row frame with alternating background
+        row_color = ("#E8E8E8", "#E8E8E8") if i % 2 == 0 else ("#F5F5F5", "#F5F5F5")
+        row_frame = ctk.CTkFrame(
+            self.middle_frame, corner_radius=0, height=45, fg_color=row_color
+        )
+        row_frame.grid(row=i, column=0, sticky="ew", padx=0, pady=0)
+        row_frame.grid_propagate(False)
+
+        # Configure columns
+        row_frame.grid_columnconfigure(0, weight=0, minsize=50)  # Checkbox
+        row_frame.grid_columnconfigure(1, weight=0, minsize=100)  # Scene number
+        row_frame.grid_columnconfigure(2, weight=0, minsize=self._scene_diff_column_px)  # Diff info
+        row_frame.grid_columnconfigure(3, weight=1)  # URL
+
+        # Center content vertically
+        row_frame.grid_rowconfigure(0, weight=1)
+
+        # Checkbox
+        checkbox_var = tk.BooleanVar(value=True)
+        checkbox = ctk.CTkCheckBox(
+            row_frame, text="", variable=checkbox_var, width=30
+        )
+        checkbox.grid(row=0, column=0, padx=(15, 5), sticky="w")
 
-            # Scene label
-            scene_label = ctk.CTkLabel(
-                row_frame, text="Scene NA", font=ctk.CTkFont(weight="bold"), anchor="w"
-            )
-            scene_label.grid(row=0, column=1, padx=5, sticky="w")
+        # Scene label
+        scene_label = ctk.CTkLabel(
+            row_frame, text="Scene NA", font=ctk.CTkFont(weight="bold"), anchor="w"
+        )
+        scene_label.grid(row=0, column=1, padx=5, sticky="w")
 
-            # Diff label
-            diff_label = ctk.CTkLabel(
-                row_frame,
-                text="N/A\nN/A",
-                font=ctk.CTkFont(size=12),
-                anchor="w",
-                justify="left",
-            )
-            diff_label.grid(row=0, column=2, padx=5, sticky="w")
-            diff_label.configure(width=0)
-
-            # URL label
-            url_label = ctk.CTkLabel(
-                master=row_frame,
-                text="No URL",
-                width=200,
-                justify="left",
-                font=ctk.CTkFont(size=12),
-                anchor="w",
-            )
-            url_label.grid(row=0, column=3, padx=5, sticky="we")
+        # Diff label
+        diff_label = ctk.CTkLabel(
+            row_frame,
+            text="N/A\nN/A",
+            font=ctk.CTkFont(size=12),
+            anchor="w",
+            justify="left",
+        )
+        diff_label.grid(row=0, column=2, padx=5, sticky="w")
+        diff_label.configure(width=0)
 
-            self.scene_row_frames.append(row_frame)
-            self.checkbox_vars.append(checkbox_var)
-            self.scene_num_labels.append(scene_label)
-            self.diff_labels.append(diff_label)
-            self.url_labels.append(url_label)
-            tooltip = ToolTip(url_label, "No URLs available")
-            self.url_tooltips.append(tooltip)
+        # URL label
+        url_label = ctk.CTkLabel(
+            master=row_frame,
+            text="No URL",
+            width=200,
+            justify="left",
+            font=ctk.CTkFont(size=12),
+            anchor="w",
+        )
+        url_label.grid(row=0, column=3, padx=5, sticky="we")
+
+        row = SceneRow(
+            frame=row_frame,
+            checkbox_var=checkbox_var,
+            scene_label=scene_label,
+            diff_label=diff_label,
+            url_label=url_label,
+            tooltip=ToolTip(url_label, "No URLs available"),
+        )
+        self.scene_rows.append(row)
+        return row
 
     def _refresh_scene_canvas_scrollregion(self, event=None):
         if not hasattr(self, "middle_canvas"):
@@ -1002,8 +1170,6 @@ class UrlStashGUI(ctk.CTk):
         self.process_history_button.pack(side="right")
 
         # Create notebook for tabs
-        from tkinter import ttk
-
         notebook = ttk.Notebook(container)
         notebook.pack(fill="both", expand=True)
 
@@ -1318,6 +1484,7 @@ class UrlStashGUI(ctk.CTk):
         content = self.url_filter_text.get("1.0", tk.END)
         filters = [line.strip() for line in content.splitlines() if line.strip()]
         self.url_filters = filters
+        self._clear_browser_url_cache()
         self.persist_config_changes()
         messagebox.showinfo(
             "Filters Saved", f"URL filters updated ({len(filters)} pattern(s))."
@@ -1528,20 +1695,6 @@ class UrlStashGUI(ctk.CTk):
         except Exception as e:
             logger.error(f"[JSON] Failed to update JSON config: {e}")
 
-    def sleep_with_pause(self, duration):
-        start_time = time.time()
-        increment = 0.1
-        while time.time() - start_time < duration:
-            if self.stop_event.is_set():
-                return
-
-            self.pause_event.wait(timeout=increment)
-            if not self.pause_event.is_set():
-                while not self.pause_event.is_set() and not self.stop_event.is_set():
-                    time.sleep(increment)
-                if self.stop_event.is_set():
-                    return
-
     def update_status(self, message, color="black"):
         """Update the status label with message and color"""
         try:
@@ -1631,6 +1784,17 @@ class UrlStashGUI(ctk.CTk):
             # Widget has been destroyed or is invalid - safely ignore
             pass
 
+    def _apply_scan_state(self, state):
+        """Apply UI state collected by a worker thread in one main-loop callback."""
+        if "connection_ready" in state:
+            self.set_connection_ready(state["connection_ready"])
+        if "end_id_text" in state:
+            self._update_end_id_label(text=state["end_id_text"])
+        if "progress" in state:
+            self.update_progress(state["progress"])
+        if "status" in state:
+            self.update_status(*state["status"])
+
     def show_error_message(self, title, message, suggestions=None, error_details=None):
         """Show standardized error message with optional suggestions and collapsible error details"""
         self.update_status(f"Error: {title}", "red")
@@ -1806,13 +1970,18 @@ class UrlStashGUI(ctk.CTk):
         try:
             conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
             cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            # Only tables whose DDL mentions both words can have both columns;
+            # LIKE is case-insensitive, and PRAGMA confirms the survivors.
+            cursor.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type='table' AND sql LIKE '%url%' AND sql LIKE '%title%'"
+            )
             tables = [row[0] for row in cursor.fetchall()]
             for tbl in tables:
                 try:
-                    cursor.execute(f"PRAGMA table_info(\"{tbl}\")")
-                    columns_info = cursor.fetchall()
-                    columns = [col[1].lower() for col in columns_info]
+                    quoted_tbl = '"' + tbl.replace('"', '""') + '"'
+                    cursor.execute(f"PRAGMA table_info({quoted_tbl})")
+                    columns = {col[1].lower() for col in cursor.fetchall()}
                     if "url" in columns and "title" in columns:
                         valid_tables_found.append(tbl)
                 except sqlite3.Error as e_tbl:
@@ -1831,97 +2000,164 @@ class UrlStashGUI(ctk.CTk):
             logger.error(f"{temp_db_path} not found for appending.")
             return None
 
-        main_db_path = "browserHistory.db"
-        main_conn, temp_conn = None, None
+        main_conn = None
         appended_count = 0
 
-        try:
-            temp_conn = sqlite3.connect(f"file:{temp_db_path}?mode=ro", uri=True)
-            temp_cursor = temp_conn.cursor()
-
-            main_conn = sqlite3.connect(main_db_path)
-            main_cursor = main_conn.cursor()
-
-            main_cursor.execute("""
-                CREATE TABLE IF NOT EXISTS browser_hist (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT UNIQUE,
-                    title TEXT,
-                    browser TEXT,
-                    historytitle TEXT,
-                    source_file TEXT
-                )
-            """)
-            main_conn.commit()
-
-            main_cursor.execute("PRAGMA table_info(browser_hist)")
-            columns = [info[1] for info in main_cursor.fetchall()]
-            if 'source_file' not in columns:
-                main_cursor.execute("ALTER TABLE browser_hist ADD COLUMN source_file TEXT")
+        with self._write_lock:
+            try:
+                self._close_history_conn()
+                main_conn = self._get_write_conn()
+                main_cursor = main_conn.cursor()
+                # Only takes effect while the file is still empty, i.e. on first creation.
+                main_cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                # Copy rows inside SQLite instead of round-tripping them through Python.
+                # Attach the plain path: the connection is not opened with uri=True,
+                # so a file: URI would be taken as a literal (empty) file name.
+                main_cursor.execute("ATTACH DATABASE ? AS src", (temp_db_path,))
+
+                main_cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS browser_hist (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        url TEXT UNIQUE,
+                        title TEXT,
+                        browser TEXT,
+                        historytitle TEXT,
+                        source_file TEXT
+                    )
+                """)
                 main_conn.commit()
 
-            main_cursor.execute("""
-                DELETE FROM browser_hist
-                WHERE id NOT IN (
-                    SELECT MIN(id) FROM browser_hist GROUP BY url
+                main_cursor.execute("PRAGMA table_info(browser_hist)")
+                columns = [info[1] for info in main_cursor.fetchall()]
+                if 'source_file' not in columns:
+                    main_cursor.execute("ALTER TABLE browser_hist ADD COLUMN source_file TEXT")
+                    main_conn.commit()
+
+                # Databases from older versions may lack a unique url index; collapse
+                # their duplicates once and add it. Otherwise skip the full-table pass.
+                if not self._browser_history_has_unique_url_index(main_cursor):
+                    main_cursor.execute("""
+                        DELETE FROM browser_hist
+                        WHERE id NOT IN (
+                            SELECT MIN(id) FROM browser_hist GROUP BY url
+                        )
+                    """)
+                    main_conn.commit()
+
+                    try:
+                        main_cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_browser_hist_url ON browser_hist(url)")
+                        main_conn.commit()
+                    except sqlite3.IntegrityError as e:
+                        logger.warning(f"Could not create unique index due to existing duplicates: {e}")
+
+                quoted_table = '"' + table_name.replace('"', '""') + '"'
+                main_cursor.execute(f"PRAGMA src.table_info({quoted_table})")
+                source_columns = [col[1].lower() for col in main_cursor.fetchall()]
+
+                select_title_col = "title" if "title" in source_columns else "NULL"
+                if "url" not in source_columns:
+                    logger.error(f"Source table '{table_name}' in {original_source_filepath} does not have 'url' column.")
+                    return 0
+
+                source_filename_for_db = os.path.basename(original_source_filepath)
+
+                # One INSERT ... SELECT copies every row; duplicate URLs are ignored.
+                main_cursor.execute(
+                    f"""
+                    INSERT OR IGNORE INTO browser_hist (url, title, browser, source_file, historytitle)
+                    SELECT url, {select_title_col}, ?, ?, sanitize_title({select_title_col})
+                    FROM src.{quoted_table}
+                    WHERE url IS NOT NULL AND url != ''
+                    """,
+                    (browser_label, source_filename_for_db),
                 )
-            """)
-            main_conn.commit()
+                appended_count = max(main_cursor.rowcount, 0)
 
-            try:
-                main_cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_browser_hist_url ON browser_hist(url)")
+                main_cursor.execute(HISTORYTITLE_INDEX_SQL)
                 main_conn.commit()
-            except sqlite3.IntegrityError as e:
-                logger.warning(f"Could not create unique index due to existing duplicates: {e}")
 
-            temp_cursor.execute(f"PRAGMA table_info(\"{table_name}\")")
-            source_columns = [col[1].lower() for col in temp_cursor.fetchall()]
-
-            select_title_col = "title" if "title" in source_columns else "NULL AS title"
-            if "url" not in source_columns:
-                logger.error(f"Source table '{table_name}' in {original_source_filepath} does not have 'url' column.")
-                return 0
+                if appended_count > 0:
+                    logger.info(f"{appended_count} new unique rows from '{table_name}' in '{original_source_filepath}' appended.")
+                else:
+                    logger.info(f"No new unique rows from '{table_name}' in '{original_source_filepath}' to append.")
 
-            select_sql = f"SELECT url, {select_title_col} FROM \"{table_name}\" WHERE url IS NOT NULL AND url != ''"
-            temp_cursor.execute(select_sql)
-            rows = temp_cursor.fetchall()
+                return appended_count
 
-            insert_sql = "INSERT OR IGNORE INTO browser_hist (url, title, browser, source_file, historytitle) VALUES (?, ?, ?, ?, ?)"
-            source_filename_for_db = os.path.basename(original_source_filepath)
+            except sqlite3.Error as e:
+                logger.error(f"SQLite error appending data from '{table_name}' ({original_source_filepath}): {e}", exc_info=True)
+                return None
+            finally:
+                if main_conn:
+                    self._detach_source_db(main_conn)
+
+    def _get_write_conn(self):
+        """Return the shared writable browserHistory.db connection.
+
+        The sync, dedupe, clean and repack steps run one after another, so they
+        reuse a single handle instead of reopening the file and re-reading its
+        schema at every step. Callers must hold ``_write_lock`` for as long as
+        they use the connection.
+        """
+        with self._write_lock:
+            if self._write_conn is None:
+                conn = sqlite3.connect(self.history_db_path, check_same_thread=False)
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA cache_size=-65536")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.create_function(
+                    "sanitize_title", 1, _sanitize_history_title, deterministic=True
+                )
+                self._write_conn = conn
+            return self._write_conn
 
-            for row_url, row_title in rows:
-                try:
-                    historytitle = sanitize_for_windows(str(row_title)) if row_title else ""
-
-                    res = main_cursor.execute(insert_sql, (
-                        row_url,
-                        row_title,
-                        browser_label,
-                        source_filename_for_db,
-                        historytitle
-                    ))
-                    if res.rowcount > 0:
-                        appended_count += 1
-                except sqlite3.Error as e_insert:
-                    logger.warning(f"Could not insert row (URL: {row_url}) from {browser_label}: {e_insert}")
-
-            main_conn.commit()
-
-            if appended_count > 0:
-                logger.info(f"{appended_count} new unique rows from '{table_name}' in '{original_source_filepath}' appended.")
-            else:
-                logger.info(f"No new unique rows from '{table_name}' in '{original_source_filepath}' to append.")
+    def _rollback_write_conn(self):
+        # Leave the shared connection outside a transaction after a failed step.
+        with self._write_lock:
+            if self._write_conn is None:
+                return
+            try:
+                self._write_conn.rollback()
+            except sqlite3.Error as e:
+                logger.warning(f"Error rolling back browser history connection: {e}")
+
+    def _detach_source_db(self, conn):
+        # The temp copy is deleted right after appending, so never leave it attached.
+        with self._write_lock:
+            self._rollback_write_conn()
+            try:
+                conn.execute("DETACH DATABASE src")
+            except sqlite3.Error:
+                pass
 
-            return appended_count
+    def _close_write_conn(self, blocking=True):
+        """Close the shared writable browserHistory.db connection.
 
-        except sqlite3.Error as e:
-            logger.error(f"SQLite error appending data from '{table_name}' ({original_source_filepath}): {e}", exc_info=True)
-            return None
+        Waits for a step that is still using the connection to finish first,
+        or with ``blocking=False`` skips the close while one is running.
+        """
+        if not self._write_lock.acquire(blocking=blocking):
+            logger.info("Browser history write connection busy; not closing it.")
+            return
+        try:
+            if self._write_conn is None:
+                return
+            try:
+                self._write_conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing browser history write connection: {e}")
+            self._write_conn = None
         finally:
-            if temp_conn:
-                temp_conn.close()
-            if main_conn:
-                main_conn.close()
+            self._write_lock.release()
+
+    def _begin_history_sync(self):
+        """Claim the browser history sync; False if another sync is running."""
+        if self._history_sync_lock.acquire(blocking=False):
+            return True
+        logger.warning("A browser history sync is already running; skipping this request.")
+        return False
+
+    def _end_history_sync(self):
+        self._history_sync_lock.release()
 
     def _ensure_browser_history_metadata_table(self, cursor):
         cursor.execute("""
@@ -1957,29 +2193,28 @@ class UrlStashGUI(ctk.CTk):
             "url_replacements": json.dumps(normalized_replacements, ensure_ascii=True),
         }
 
-    def _get_stored_history_processing_settings(self, db_path="browserHistory.db"):
+    def _get_stored_history_processing_settings(self):
+        db_path = self.history_db_path
         if not os.path.exists(db_path):
             return None
 
-        conn = None
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            self._ensure_browser_history_metadata_table(cursor)
-            conn.commit()
-
-            settings = {}
-            for key in ("url_filters", "url_replacements"):
-                cursor.execute("SELECT value FROM app_metadata WHERE key = ?", (key,))
-                row = cursor.fetchone()
-                settings[key] = row[0] if row else None
-            return settings
-        except sqlite3.Error as e:
-            logger.error(f"Failed to read stored browser history processing settings from {db_path}: {e}", exc_info=True)
-            return None
-        finally:
-            if conn:
-                conn.close()
+        with self._write_lock:
+            try:
+                conn = self._get_write_conn()
+                cursor = conn.cursor()
+                self._ensure_browser_history_metadata_table(cursor)
+                conn.commit()
+
+                settings = {}
+                for key in ("url_filters", "url_replacements"):
+                    cursor.execute("SELECT value FROM app_metadata WHERE key = ?", (key,))
+                    row = cursor.fetchone()
+                    settings[key] = row[0] if row else None
+                return settings
+            except sqlite3.Error as e:
+                logger.error(f"Failed to read stored browser history processing settings from {db_path}: {e}", exc_info=True)
+                self._rollback_write_conn()
+                return None
 
     def _store_history_processing_settings(self, cursor):
         self._ensure_browser_history_metadata_table(cursor)
@@ -1991,7 +2226,7 @@ class UrlStashGUI(ctk.CTk):
                 (key, value),
             )
 
-    def _should_run_browser_history_maintenance(self, rows_appended, db_path="browserHistory.db"):
+    def _should_run_browser_history_maintenance(self, rows_appended):
         if rows_appended > 0:
             logger.info(
                 "Running deduplication and cleaning because new browser history rows were appended."
@@ -1999,7 +2234,7 @@ class UrlStashGUI(ctk.CTk):
             return True
 
         current_settings = self._get_current_history_processing_settings()
-        stored_settings = self._get_stored_history_processing_settings(db_path)
+        stored_settings = self._get_stored_history_processing_settings()
         if not stored_settings:
             logger.info(
                 "Running deduplication and cleaning because no stored DB processing settings were found."
@@ -2017,6 +2252,19 @@ class UrlStashGUI(ctk.CTk):
         )
         return False
 
+    def _browser_history_has_unique_url_index(self, cursor):
+        """Return True if a unique index on browser_hist(url) alone exists."""
+        cursor.execute("""
+            SELECT 1
+            FROM pragma_index_list('browser_hist') AS il
+            JOIN pragma_index_info(il.name) AS ii
+            WHERE il."unique" = 1
+            GROUP BY il.name
+            HAVING COUNT(*) = 1 AND MAX(ii.name) = 'url'
+            LIMIT 1
+        """)
+        return cursor.fetchone() is not None
+
     def _browser_history_has_duplicate_urls(self, cursor):
         cursor.execute("""
             SELECT 1
@@ -2030,57 +2278,61 @@ class UrlStashGUI(ctk.CTk):
 
     def remove_duplicates(self, run_vacuum=False):
         """Remove duplicates from browser history database"""
-        db_path = "browserHistory.db"
+        db_path = self.history_db_path
         if not os.path.exists(db_path):
             logger.warning(f"{db_path} not found. Cannot remove duplicates.")
             return
 
         duplicates_found = False
-        conn = None
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
+        with self._write_lock:
+            try:
+                self._close_history_conn()
+                conn = self._get_write_conn()
+                cursor = conn.cursor()
 
-            logger.info("Starting deduplication based on url and title...")
+                logger.info("Starting deduplication based on url and title...")
 
-            duplicates_found = self._browser_history_has_duplicate_urls(cursor)
-            if not duplicates_found:
-                logger.info("Skipped duplicate rewrite because no duplicate URLs were found.")
-                return
+                # A unique url index already rules out duplicate (url, title) pairs
+                if self._browser_history_has_unique_url_index(cursor):
+                    logger.info("Skipped duplicate scan because browser_hist.url is uniquely indexed.")
+                    return
 
-            cursor.executescript("""
-                CREATE TEMP TABLE IF NOT EXISTS temp_browser_hist AS
-                SELECT * FROM browser_hist
-                WHERE id IN (
-                    SELECT MAX(id) FROM browser_hist
-                    GROUP BY url, title
-                );
+                duplicates_found = self._browser_history_has_duplicate_urls(cursor)
+                if not duplicates_found:
+                    logger.info("Skipped duplicate rewrite because no duplicate URLs were found.")
+                    return
 
-                DELETE FROM browser_hist;
+                cursor.executescript("""
+                    CREATE TEMP TABLE IF NOT EXISTS temp_browser_hist AS
+                    SELECT * FROM browser_hist
+                    WHERE id IN (
+                        SELECT MAX(id) FROM browser_hist
+                        GROUP BY url, title
+                    );
 
-                INSERT INTO browser_hist (id, url, title, browser, historytitle, source_file)
-                SELECT id, url, title, browser, historytitle, source_file FROM temp_browser_hist;
+                    DELETE FROM browser_hist;
 
-                DROP TABLE temp_browser_hist;
-            """)
+                    INSERT INTO browser_hist (id, url, title, browser, historytitle, source_file)
+                    SELECT id, url, title, browser, historytitle, source_file FROM temp_browser_hist;
 
-            conn.commit()
-            logger.info("Deduplication complete. Duplicate (url, title) pairs removed.")
-        except sqlite3.Error as e:
-            logger.error(f"Failed to remove duplicates from {db_path}: {e}", exc_info=True)
-        finally:
-            if conn:
-                conn.close()
+                    DROP TABLE temp_browser_hist;
+                """)
+
+                conn.commit()
+                logger.info("Deduplication complete. Duplicate (url, title) pairs removed.")
+            except sqlite3.Error as e:
+                logger.error(f"Failed to remove duplicates from {db_path}: {e}", exc_info=True)
+                self._rollback_write_conn()
 
         if duplicates_found:
             if run_vacuum:
-                self.repack_database(db_path)
+                self.repack_database()
             else:
                 logger.info("VACUUM deferred after deduplication.")
 
     def clean_urls_merged_db(self, run_vacuum=False):
         """Clean URLs in the merged database"""
-        main_db_path = "browserHistory.db"
+        main_db_path = self.history_db_path
         if not os.path.exists(main_db_path):
             logger.warning(f"{main_db_path} not found. Cannot clean.")
             return
@@ -2092,154 +2344,158 @@ class UrlStashGUI(ctk.CTk):
         logger.info(f"Using URL filters: {active_filters if active_filters else 'None'}")
         logger.info(f"Using URL replacements: {active_replacements if active_replacements else 'None'}")
 
-        conn = None
-        try:
-            conn = sqlite3.connect(main_db_path)
-            cursor = conn.cursor()
+        with self._write_lock:
+            try:
+                self._close_history_conn()
+                conn = self._get_write_conn()
+                cursor = conn.cursor()
+
+                # All cleaning steps share one transaction, committed once at the end.
+                res = cursor.execute("DELETE FROM browser_hist WHERE title IS NULL OR title = '' OR url IS NULL OR url = ''")
+                no_title_empty_url_removed = max(res.rowcount, 0)
+                if no_title_empty_url_removed > 0:
+                    logger.info(f"Removed {no_title_empty_url_removed} entries with no title or empty URL.")
+
+                total_filtered_removed = 0
+                filter_patterns = [f_pattern for f_pattern in active_filters if f_pattern.strip()]
+                if filter_patterns:
+                    # One pass over the table for all filters; the patterns live in a
+                    # temp table so the statement text stays the same for any count.
+                    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS url_filter_patterns (p TEXT)")
+                    cursor.execute("DELETE FROM temp.url_filter_patterns")
+                    cursor.executemany(
+                        "INSERT INTO temp.url_filter_patterns (p) VALUES (?)",
+                        [(f_pattern,) for f_pattern in filter_patterns],
+                    )
+                    res = cursor.execute("""
+                        DELETE FROM browser_hist
+                        WHERE EXISTS (
+                            SELECT 1 FROM temp.url_filter_patterns f
+                            WHERE browser_hist.url LIKE '%' || f.p || '%'
+                        )
+                    """)
+                    total_filtered_removed = res.rowcount
+                if total_filtered_removed > 0 or active_filters:
+                    logger.info(f"Total entries removed by filters: {total_filtered_removed}.")
+
+                replacements_matched_total = 0
+                replacements_updated_total = 0
+                replacements_skipped_total = 0
+                if active_replacements:
+                    for rep_pair in active_replacements:
+                        find_text = rep_pair.get("url_text","")
+                        replace_text = rep_pair.get("replace_with","")
+                        if not find_text.strip():
+                            continue
+                        try:
+                            # Count rows that actually contain the search text before update.
+                            candidate_count = cursor.execute(
+                                "SELECT COUNT(*) FROM browser_hist WHERE url LIKE ?",
+                                (f"%{find_text}%",),
+                            ).fetchone()[0]
 
-            count_initial = cursor.execute("SELECT COUNT(*) FROM browser_hist").fetchone()[0]
+                            if candidate_count <= 0:
+                                logger.info(
+                                    f"Replacement '{find_text}'->'{replace_text}' matched 0 rows, updated 0 rows, skipped 0."
+                                )
+                                continue
 
-            cursor.execute("DELETE FROM browser_hist WHERE title IS NULL OR title = '' OR url IS NULL OR url = ''")
-            conn.commit()
-            count_after_no_title_empty_url = cursor.execute("SELECT COUNT(*) FROM browser_hist").fetchone()[0]
-            no_title_empty_url_removed = count_initial - count_after_no_title_empty_url
-            if no_title_empty_url_removed > 0:
-                logger.info(f"Removed {no_title_empty_url_removed} entries with no title or empty URL.")
+                            res = cursor.execute(
+                                "UPDATE OR IGNORE browser_hist "
+                                "SET url = REPLACE(url, ?, ?) "
+                                "WHERE url LIKE ?",
+                                (find_text, replace_text, f"%{find_text}%")
+                            )
+                            updated_count = res.rowcount if res.rowcount and res.rowcount > 0 else 0
+                            skipped_count = max(candidate_count - updated_count, 0)
 
-            total_filtered_removed = 0
-            if active_filters:
-                for f_pattern in active_filters:
-                    if not f_pattern.strip():
-                        continue
-                    res = cursor.execute("DELETE FROM browser_hist WHERE url LIKE ?", (f"%{f_pattern}%",))
-                    removed_this_filter = res.rowcount
-                    if removed_this_filter > 0:
-                        logger.info(f"Filter '{f_pattern}' removed {removed_this_filter} entries.")
-                    total_filtered_removed += removed_this_filter
-            conn.commit()
-            if total_filtered_removed > 0 or active_filters:
-                logger.info(f"Total entries removed by filters: {total_filtered_removed}.")
-
-            replacements_matched_total = 0
-            replacements_updated_total = 0
-            replacements_skipped_total = 0
-            if active_replacements:
-                for rep_pair in active_replacements:
-                    find_text = rep_pair.get("url_text","")
-                    replace_text = rep_pair.get("replace_with","")
-                    if not find_text.strip():
-                        continue
-                    try:
-                        # Count rows that actually contain the search text before update.
-                        candidate_count = cursor.execute(
-                            "SELECT COUNT(*) FROM browser_hist WHERE url LIKE ?",
-                            (f"%{find_text}%",),
-                        ).fetchone()[0]
+                            replacements_matched_total += candidate_count
+                            replacements_updated_total += updated_count
+                            replacements_skipped_total += skipped_count
 
-                        if candidate_count <= 0:
                             logger.info(
-                                f"Replacement '{find_text}'->'{replace_text}' matched 0 rows, updated 0 rows, skipped 0."
+                                f"Replacement '{find_text}'->'{replace_text}' matched {candidate_count} rows, "
+                                f"updated {updated_count} rows, skipped {skipped_count}."
                             )
-                            continue
-
-                        res = cursor.execute(
-                            "UPDATE OR IGNORE browser_hist "
-                            "SET url = REPLACE(url, ?, ?) "
-                            "WHERE url LIKE ?",
-                            (find_text, replace_text, f"%{find_text}%")
-                        )
-                        updated_count = res.rowcount if res.rowcount and res.rowcount > 0 else 0
-                        skipped_count = max(candidate_count - updated_count, 0)
-
-                        replacements_matched_total += candidate_count
-                        replacements_updated_total += updated_count
-                        replacements_skipped_total += skipped_count
-
-                        logger.info(
-                            f"Replacement '{find_text}'->'{replace_text}' matched {candidate_count} rows, "
-                            f"updated {updated_count} rows, skipped {skipped_count}."
-                        )
-                    except sqlite3.IntegrityError as e:
-                        logger.warning(f"Skipping replacement '{find_text}'->'{replace_text}' due to duplicate URL: {e}")
-            conn.commit()
-            if active_replacements:
-                logger.info(
-                    "Total rows affected by URL replacements: "
-                    f"matched={replacements_matched_total}, "
-                    f"updated={replacements_updated_total}, "
-                    f"skipped={replacements_skipped_total}."
-                )
-
-            cursor.execute("""
-                SELECT id, title
-                FROM browser_hist
-                WHERE title IS NOT NULL
-                  AND title <> ''
-                  AND (historytitle IS NULL OR historytitle = '')
-            """)
-            rows_for_historytitle = cursor.fetchall()
-            for row_id, title_val in rows_for_historytitle:
-                simple_title = sanitize_for_windows(str(title_val))
-                cursor.execute(
-                    "UPDATE browser_hist SET historytitle = ? WHERE id = ?",
-                    (simple_title, row_id)
-                )
-            conn.commit()
-            logger.info(f"Generated/updated 'historytitle' for {len(rows_for_historytitle)} entries.")
-
-            '''
-            logger.info("Refreshing 'tableHits' summary table for repeated titles (count >= 2)...")
-            cursor.execute("DROP TABLE IF EXISTS tableHits")
-            conn.commit()
-
-            cursor.execute("""
-                CREATE TABLE tableHits AS
-                SELECT historytitle AS ht, COUNT(*) AS cnt
-                FROM browser_hist
-                WHERE historytitle IS NOT NULL AND historytitle != ''
-                GROUP BY historytitle
-                HAVING COUNT(*) >= 2
-            """)
-            conn.commit()
-
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tableHits_ht ON tableHits(ht)")
-            conn.commit()
-
-            logger.info("'tableHits' table refreshed.")
-            '''
-
-            count_final = cursor.execute("SELECT COUNT(*) FROM browser_hist").fetchone()[0]
-            self._store_history_processing_settings(cursor)
-            conn.commit()
-            logger.info(f"Cleaning of {main_db_path} complete. Final entry count: {count_final}.")
-
-            if run_vacuum:
-                self.repack_database(main_db_path)
-            else:
-                logger.info("VACUUM deferred after cleaning.")
-
-        except sqlite3.Error as e:
-            logger.error(f"Error cleaning URLs: {e}", exc_info=True)
-        finally:
-            if conn:
-                conn.close()
+                        except sqlite3.IntegrityError as e:
+                            logger.warning(f"Skipping replacement '{find_text}'->'{replace_text}' due to duplicate URL: {e}")
+                if active_replacements:
+                    logger.info(
+                        "Total rows affected by URL replacements: "
+                        f"matched={replacements_matched_total}, "
+                        f"updated={replacements_updated_total}, "
+                        f"skipped={replacements_skipped_total}."
+                    )
 
-    def repack_database(self, db_path_to_repack):
-        """Repack (VACUUM) the database"""
+                # Fill historytitle in one statement; SQLite calls back into
+                # sanitize_for_windows per row instead of round-tripping rows.
+                res = cursor.execute("""
+                    UPDATE browser_hist
+                    SET historytitle = sanitize_title(title)
+                    WHERE title IS NOT NULL
+                      AND title <> ''
+                      AND (historytitle IS NULL OR historytitle = '')
+                """)
+                historytitle_updated = max(res.rowcount, 0)
+                cursor.execute(HISTORYTITLE_INDEX_SQL)
+                logger.info(f"Generated/updated 'historytitle' for {historytitle_updated} entries.")
+
+                '''
+                logger.info("Refreshing 'tableHits' summary table for repeated titles (count >= 2)...")
+                cursor.execute("DROP TABLE IF EXISTS tableHits")
+                conn.commit()
+
+                cursor.execute("""
+                    CREATE TABLE tableHits AS
+                    SELECT historytitle AS ht, COUNT(*) AS cnt
+                    FROM browser_hist
+                    WHERE historytitle IS NOT NULL AND historytitle != ''
+                    GROUP BY historytitle
+                    HAVING COUNT(*) >= 2
+                """)
+                conn.commit()
+
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_tableHits_ht ON tableHits(ht)")
+                conn.commit()
+
+                logger.info("'tableHits' table refreshed.")
+                '''
+
+                count_final = cursor.execute("SELECT COUNT(*) FROM browser_hist").fetchone()[0]
+                self._store_history_processing_settings(cursor)
+                conn.commit()
+                logger.info(f"Cleaning of {main_db_path} complete. Final entry count: {count_final}.")
+
+                if run_vacuum:
+                    self.repack_database()
+                else:
+                    # Hand back pages freed by this clean without rewriting the file;
+                    # a no-op on databases created before auto_vacuum was enabled.
+                    # executescript steps the pragma to completion, execute would
+                    # only free a single page.
+                    conn.executescript("PRAGMA incremental_vacuum;")
+                    logger.info("Full VACUUM deferred after cleaning.")
+
+            except sqlite3.Error as e:
+                logger.error(f"Error cleaning URLs: {e}", exc_info=True)
+                self._rollback_write_conn()
+
+    def repack_database(self):
+        """Repack (VACUUM) the browser history database"""
+        db_path_to_repack = self.history_db_path
         if not os.path.exists(db_path_to_repack):
             logger.warning(f"Database {db_path_to_repack} not found, cannot repack.")
             return
-        conn = None
-        try:
-            conn = sqlite3.connect(db_path_to_repack)
-            conn.execute("VACUUM")
-            conn.commit()
-            logger.info(f"Database {db_path_to_repack} repacked (VACUUMed).")
-        except sqlite3.Error as e:
-            logger.error(f"Failed to repack {db_path_to_repack}: {e}", exc_info=True)
-        finally:
-            if conn:
-                conn.close()
+        with self._write_lock:
+            try:
+                self._close_history_conn()
+                conn = self._get_write_conn()
+                conn.execute("VACUUM")
+                conn.commit()
+                logger.info(f"Database {db_path_to_repack} repacked (VACUUMed).")
+            except sqlite3.Error as e:
+                logger.error(f"Failed to repack {db_path_to_repack}: {e}", exc_info=True)
+                self._rollback_write_conn()
 
     def process_single_history_file_and_clean(self, source_filepath, run_maintenance=True, return_rows=False):
         """Process a single history file: copy, append, deduplicate, and clean"""
@@ -2277,7 +2533,7 @@ class UrlStashGUI(ctk.CTk):
                 logger.info(f"NEW ENTRIES: No new unique rows appended from {source_filepath} (data may already exist or source was empty/filtered).")
 
             if file_processed_successfully:
-                if os.path.exists("browserHistory.db"):
+                if os.path.exists(self.history_db_path):
                     if run_maintenance and self._should_run_browser_history_maintenance(rows_appended_from_this_source):
                         logger.info(f"Running deduplication and cleaning for browserHistory.db after processing {source_filepath}...")
                         self.remove_duplicates(run_vacuum=False)
@@ -2367,6 +2623,10 @@ class UrlStashGUI(ctk.CTk):
 
     def copy_places_db(self):
         """Process browser history: sync and clean all configured sources"""
+        if not self._begin_history_sync():
+            self.update_status("History sync already running", "orange")
+            return
+
         # Disable button during processing if it exists
         if hasattr(self, 'process_history_button'):
             self.process_history_button.configure(state="disabled", text="Processing...")
@@ -2379,6 +2639,7 @@ class UrlStashGUI(ctk.CTk):
             try:
                 self.sync_and_clean_all_sources()
             finally:
+                self._end_history_sync()
                 # Restore button state
                 if hasattr(self, 'process_history_button'):
                     self.process_history_button.configure(
@@ -2389,14 +2650,25 @@ class UrlStashGUI(ctk.CTk):
         # Start in thread to keep UI responsive
         threading.Thread(target=run_sync, daemon=True).start()
 
-    def get_last_scene_id_from_log(self):
+    def get_last_scene_id_from_log(self, chunk_size=4096, max_bytes=262144):
+        # Scan backwards from the end of the log so only the tail is read.
         try:
-            with open(LOG_FILE_NAME, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            for line in reversed(lines):
-                match = re.search(r"Loaded scene (\d+)", line)
-                if match:
-                    return int(match.group(1))
+            with open(LOG_FILE_NAME, "rb") as f:
+                position = f.seek(0, os.SEEK_END)
+                scanned = 0
+                partial_line = b""
+                while position > 0 and scanned < max_bytes:
+                    read_size = min(chunk_size, position)
+                    position -= read_size
+                    scanned += read_size
+                    f.seek(position)
+                    lines = (f.read(read_size) + partial_line).split(b"\n")
+                    # The first piece may continue in the previous chunk.
+                    partial_line = lines.pop(0) if position > 0 else b""
+                    for line in reversed(lines):
+                        match = LOADED_SCENE_RE.search(line)
+                        if match:
+                            return int(match.group(1))
         except Exception as e:
             logger.error(f"Error reading log file: {e}")
         return None
@@ -2470,18 +2742,87 @@ class UrlStashGUI(ctk.CTk):
         )
         self.processing_thread.start()
 
+    def _get_stash(self):
+        """Return the cached StashInterface, reconnecting only if settings changed.
+
+        Safe to call from worker threads; concurrent callers share one client.
+        """
+        key = (
+            self.scheme_var.get(),
+            self.host_var.get(),
+            self.port_var.get(),
+            self.apikey_var.get(),
+        )
+        with self._stash_lock:
+            if self.stash is None or key != self._stash_key:
+                scheme, host, port, apikey = key
+                self.stash = StashInterface(
+                    {
+                        "scheme": scheme,
+                        "Host": host,
+                        "Port": port,
+                        "ApiKey": apikey,
+                        "Logger": logger,
+                    }
+                )
+                self._stash_key = key
+            return self.stash
+
+    def _get_urlhistory_tag_id(self, stash):
+        """Return the 'URLHistory' tag ID for ``stash``, creating the tag if needed.
+
+        The ID is cached for as long as the same client is in use; lookup errors
+        propagate and are retried on the next call.
+        """
+        with self._urlhistory_tag_lock:
+            if self._urlhistory_tag_stash is not stash:
+                tag = stash.find_tag("URLHistory", create=True)
+                self._urlhistory_tag_id = tag["id"] if tag and "id" in tag else None
+                self._urlhistory_tag_stash = stash
+            return self._urlhistory_tag_id
+
+    @staticmethod
+    def _url_set(urls):
+        """Collect the URL strings of a Stash scene's urls list into a set."""
+        if not isinstance(urls, list):
+            return set()
+        return {
+            url_obj.get("url", "") if isinstance(url_obj, dict) else url_obj
+            for url_obj in urls
+            if isinstance(url_obj, (dict, str))
+        }
+
+    def _fetch_scene_batch(self, start_id, count):
+        """Fetch up to ``count`` scenes with ID >= ``start_id`` in ascending order."""
+        return self.stash.find_scenes(
+            {"id": {"value": start_id - 1, "modifier": "GREATER_THAN"}},
+            filter={"per_page": count, "sort": "id", "direction": "ASC"},
+        ) or []
+
+    def _batched_find_scenes(self, ids, fields="id urls tags { id }"):
+        """Look up scenes by ID with aliased findScene fields, one request per chunk.
+
+        Returns a dict mapping each requested ID to its scene, or None if missing.
+        """
+        scenes_by_id = {}
+        for start in range(0, len(ids), FIND_SCENE_ALIAS_BATCH):
+            chunk = ids[start:start + FIND_SCENE_ALIAS_BATCH]
+            params = ", ".join(f"$id{n}: ID" for n in range(len(chunk)))
+            selections = " ".join(
+                f"s{n}: findScene(id: $id{n}) {{ {fields} }}" for n in range(len(chunk))
+            )
+            result = self.stash.call_GQL(
+                f"query FindScenesBatch({params}) {{ {selections} }}",
+                {f"id{n}": scene_id for n, scene_id in enumerate(chunk)},
+            )
+            for n, scene_id in enumerate(chunk):
+                scenes_by_id[scene_id] = result.get(f"s{n}")
+        return scenes_by_id
+
     def _load_scenes_thread(self, initial_start_id_for_this_scan):
         max_id_local = "Unknown"
         try:
-            self.stash = StashInterface(
-                {
-                    "scheme": self.scheme_var.get(),
-                    "Host": self.host_var.get(),
-                    "Port": self.port_var.get(),
-                    "ApiKey": self.apikey_var.get(),
-                    "Logger": logger,
-                }
-            )
+            self._get_stash()
         except Exception as e:
             error_msg = "Error connecting to Stash"
             suggestions = "• Check that StashApp is running\n• Verify connection settings (scheme, host, port)\n• Test connection using the 'Test Connection' button"
@@ -2491,7 +2832,7 @@ class UrlStashGUI(ctk.CTk):
                     "Stash Connection Failed", error_msg, suggestions, error_details=str(e)
                 ),
             )
-            self.after(0, lambda: self.set_connection_ready(False))
+            self.after(0, self._apply_scan_state, {"connection_ready": False})
             self.after(0, self._finalize_ui_after_scan_attempt)
             return
 
@@ -2501,21 +2842,33 @@ class UrlStashGUI(ctk.CTk):
             )
             if scenes_desc and scenes_desc[0]:
                 max_id_local = scenes_desc[0]["id"]
-            self.after(0, lambda: self.set_connection_ready(True))
             self.after(
                 0,
-                lambda: self._update_end_id_label(text=f"End Scene ID: {max_id_local}"),
+                self._apply_scan_state,
+                {
+                    "connection_ready": True,
+                    "end_id_text": f"End Scene ID: {max_id_local}",
+                },
             )
         except Exception as e:
-            self.after(0, lambda: self.set_connection_ready(False))
             self.after(
-                0, lambda: self._update_end_id_label(text="End Scene ID: Unknown")
+                0,
+                self._apply_scan_state,
+                {"connection_ready": False, "end_id_text": "End Scene ID: Unknown"},
             )
             logger.error(f"Error retrieving maximum scene id: {e}")
 
         valid_scenes_this_run = []
         sid = initial_start_id_for_this_scan
         highest_found_scene_id = None  # Track the highest scene ID we actually found
+        pending_scenes = []  # Scenes fetched ahead of sid, in ascending ID order
+        # The next page is requested in the background while the current page is
+        # matched against the local history DB.
+        page_fetcher = ThreadPoolExecutor(max_workers=1)
+        next_page_future = None
+        # Read the Tk variable once rather than once per scanned scene
+        skip_organized = self.skip_organized_var.get()
+        reported_found_count = None
 
         while len(valid_scenes_this_run) < TARGET_SCENE_COUNT:
             if self.stop_event.is_set():
@@ -2545,58 +2898,80 @@ class UrlStashGUI(ctk.CTk):
                         f"Could not compare with max_id_local: '{max_id_local}' is not a valid integer."
                     )
 
-            # Update progress and status
-            progress = len(valid_scenes_this_run) / TARGET_SCENE_COUNT
-            self.after(0, lambda: self.update_progress(progress))
-            self.after(
-                0,
-                lambda: self.update_status(
-                    f"Matching scenes... {len(valid_scenes_this_run)}/{TARGET_SCENE_COUNT} found",
-                    "blue",
-                ),
-            )
+            # Update progress and status only when the match count moves, so
+            # skipped scenes don't queue a Tk callback each
+            found_count = len(valid_scenes_this_run)
+            if found_count != reported_found_count:
+                reported_found_count = found_count
+                self.after(
+                    0,
+                    self._apply_scan_state,
+                    {
+                        "progress": found_count / TARGET_SCENE_COUNT,
+                        "status": (
+                            f"Matching scenes... {found_count}/{TARGET_SCENE_COUNT} found",
+                            "blue",
+                        ),
+                    },
+                )
 
-            scene = self.stash.find_scene(sid)
-            current_sid_for_log = sid
-            sid += 1
+            # Fetch the next page of scenes by ID range instead of one request per ID
+            if not pending_scenes:
+                try:
+                    if next_page_future is not None:
+                        pending_scenes = next_page_future.result()
+                        next_page_future = None
+                    else:
+                        pending_scenes = self._fetch_scene_batch(sid, SCENE_BATCH_SIZE)
+                except Exception as e:
+                    logger.error(f"Error fetching scenes starting at ID {sid}: {e}")
+                    break
+                if not pending_scenes:
+                    logger.info(f"No scenes found at or above ID {sid}. Stopping scan.")
+                    break
+                # A full page means more scenes probably follow; request them now
+                if len(pending_scenes) == SCENE_BATCH_SIZE:
+                    try:
+                        next_page_start = int(pending_scenes[-1].get("id")) + 1
+                    except (TypeError, ValueError):
+                        next_page_start = None
+                    if next_page_start is not None and (
+                        max_id_local == "Unknown"
+                        or not str(max_id_local).isdigit()
+                        or next_page_start <= int(max_id_local)
+                    ):
+                        next_page_future = page_fetcher.submit(
+                            self._fetch_scene_batch, next_page_start, SCENE_BATCH_SIZE
+                        )
 
-            if not scene:
-                logger.info(f"Scene {current_sid_for_log} not found; skipping.")
-                self.sleep_with_pause(0.2)
-                continue
+            scene = pending_scenes.pop(0)
+            try:
+                sid = int(scene.get("id")) + 1
+            except (TypeError, ValueError):
+                sid += 1
 
-            if self.skip_organized_var.get() and scene.get("organized", False):
-                logger.info(f"Scene {scene.get('id')} organized, skipped")
-                self.sleep_with_pause(0.2)
+            if skip_organized and scene.get("organized", False):
+                logger.info("Scene %s organized, skipped", scene.get("id"))
                 continue
 
             files = scene.get("files")
             if not files or len(files) == 0:
-                logger.info(f"Scene {scene.get('id')} has no file; skipping.")
-                self.sleep_with_pause(0.2)
+                logger.info("Scene %s has no file; skipping.", scene.get("id"))
                 continue
 
-            filename = os.path.basename(files[0]["path"])
-            base_filename = os.path.splitext(filename)[0]
+            base_filename = scene_file_stem(files[0]["path"])
             candidates = self.get_browser_urls(base_filename)
             if not candidates:
                 logger.info(
-                    f"Scene {scene.get('id')} no matches using '{base_filename}'"
+                    "Scene %s no matches using '%s'", scene.get("id"), base_filename
                 )
-                self.sleep_with_pause(0.2)
                 continue
 
             candidate_title, candidate_url = candidates[0]
-            existing_urls = scene.get("urls", [])
-            if any(
-                (isinstance(url_obj, dict) and url_obj.get("url", "") == candidate_url)
-                or (isinstance(url_obj, str) and url_obj == candidate_url)
-                for url_obj in existing_urls
-            ):
+            if candidate_url in self._url_set(scene.get("urls", [])):
                 logger.info(
-                    f"Scene {scene.get('id')} URL already exists: {candidate_url}"
+                    "Scene %s URL already exists: %s", scene.get("id"), candidate_url
                 )
-                self.sleep_with_pause(0.2)
                 continue
 
             valid_scenes_this_run.append(scene)
@@ -2616,7 +2991,8 @@ class UrlStashGUI(ctk.CTk):
                 0,
                 lambda msg=log_message: self._log_message_with_tag(msg, "match_found"),
             )
-            self.sleep_with_pause(0.2)
+
+        page_fetcher.shutdown(wait=False, cancel_futures=True)
 
         # Calculate next_start_id intelligently:
         # - If we found scenes, start from highest_found_scene_id + 1
@@ -2718,185 +3094,333 @@ class UrlStashGUI(ctk.CTk):
             logger.info("Skipping load_current_scenes because Scenes widgets are unavailable.")
             return
 
-        self.scene_url_candidates = []
-        for i in range(TARGET_SCENE_COUNT):
-            if i >= len(self.scenes):
-                self.scene_num_labels[i].configure(text="Scene NA")
-                self.diff_labels[i].configure(text="N/A\nN/A")
-                self.url_labels[i].configure(text="No URL")
-                self.checkbox_vars[i].set(False)
-                self.url_tooltips[i].update_text("No URLs available")
-                self.scene_url_candidates.append([])
-                continue
+        # Candidate lookups run off the Tk thread; a newer refresh supersedes
+        # any resolution still in flight.
+        self._candidate_generation += 1
+        self._candidates_pending = True
+        threading.Thread(
+            target=self._resolve_candidates_thread,
+            args=(self._candidate_generation, list(self.scenes)),
+            daemon=True,
+        ).start()
 
-            scene = self.scenes[i]
-            scene_id = scene.get("id", "N/A")
-            files = scene.get("files")
+    def _resolve_candidates_thread(self, generation, scenes):
+        resolved = []
+        try:
+            for _attempt in range(2):
+                # A sync or clean that clears the memo mid-way leaves these rows
+                # built from the old database; resolve them once more in that case.
+                epoch = self._browser_url_cache_epoch
+                # Resolve every scene's candidates in one query up front; the
+                # per-scene get_browser_urls calls below then hit the memo.
+                self.prefetch_browser_urls(
+                    scene_file_stem(scene["files"][0].get("path", ""))
+                    for scene in scenes
+                    if scene.get("files")
+                )
+                resolved = [self._resolve_scene_candidates(scene) for scene in scenes]
+                if (
+                    epoch == self._browser_url_cache_epoch
+                    or generation != self._candidate_generation
+                ):
+                    break
+        except Exception as e:
+            logger.error(f"Error resolving scene candidates: {e}", exc_info=True)
+        self.after(0, self._apply_candidate_rows, generation, resolved)
 
-            filename_for_processing = "No file found"
-            candidate_title = "(none)"
-            candidate_url = ""
-            all_candidates = []
+    def _resolve_scene_candidates(self, scene):
+        """Return (scene_text, diff_text, url_text, tooltip_text, all_candidates) for a row."""
+        scene_id = scene.get("id", "N/A")
+        files = scene.get("files")
 
-            if files and len(files) > 0:
-                fname = os.path.basename(files[0].get("path", ""))
-                if fname:
-                    filename_for_processing = os.path.splitext(fname)[0]
+        filename_for_processing = "No file found"
+        candidate_title = "(none)"
+        candidate_url = ""
+        all_candidates = []
 
-            clean_base = self.clean_filename(filename_for_processing)
+        if files and len(files) > 0:
+            file_stem = scene_file_stem(files[0].get("path", ""))
+            if file_stem:
+                filename_for_processing = file_stem
 
-            if filename_for_processing != "No file found":
-                db_path = os.path.abspath("./browserHistory.db")
-                if not os.path.exists(db_path):
-                    logger.error(
-                        f"Browser History database not found at {db_path}. Cannot get URLs for {clean_base}."
-                    )
-                else:
-                    # Get all candidates for tooltip
-                    all_candidates = self.get_browser_urls(
-                        filename_for_processing, get_all=True
-                    )
+        clean_base = self.clean_filename(filename_for_processing)
 
-                    # Get primary candidate for display
-                    primary_candidates = self.get_browser_urls(
-                        filename_for_processing, get_all=False
-                    )
-                    if primary_candidates:
-                        candidate_title, candidate_url = primary_candidates[0]
-                        if not candidate_title or not candidate_title.strip():
-                            candidate_title = candidate_url
-            # Store all candidates for this scene
-            self.scene_url_candidates.append(all_candidates)
+        if filename_for_processing != "No file found":
+            db_path = self.history_db_path
+            if not os.path.exists(db_path):
+                logger.error(
+                    f"Browser History database not found at {db_path}. Cannot get URLs for {clean_base}."
+                )
+            else:
+                # Get all candidates for tooltip
+                all_candidates = self.get_browser_urls(
+                    filename_for_processing, get_all=True
+                )
 
-            try:
-                self.scene_num_labels[i].configure(text=f"Scene {int(scene_id):5d}")
-            except (ValueError, TypeError):
-                self.scene_num_labels[i].configure(text=f"Scene {scene_id}")
+                # Both lookups share one ordering, so the first tooltip row is
+                # the primary match under the current filters and database.
+                primary_candidates = all_candidates[:1]
+                if primary_candidates:
+                    candidate_title, candidate_url = primary_candidates[0]
+                    if not candidate_title or not candidate_title.strip():
+                        candidate_title = candidate_url
 
-            if len(candidate_title) > 76:
-                candidate_title_trunc = candidate_title[:74] + "..."
-            else:
-                candidate_title_trunc = candidate_title
+        try:
+            scene_text = f"Scene {int(scene_id):5d}"
+        except (ValueError, TypeError):
+            scene_text = f"Scene {scene_id}"
 
-            # Truncate clean_base to 76 chars + "…" if it’s over 76
-            if len(clean_base) > 76:
-                clean_base_trunc = clean_base[:74] + "..."
-            else:
-                clean_base_trunc = clean_base
-            self.diff_labels[i].configure(
-                text=f"{clean_base_trunc}\n{candidate_title_trunc}"
-            )
+        if len(candidate_title) > 76:
+            candidate_title_trunc = candidate_title[:74] + "..."
+        else:
+            candidate_title_trunc = candidate_title
 
-            title_hit_val = len(all_candidates)
-            display_prefix = f"({title_hit_val}) " if title_hit_val else ""
-            display_url = candidate_url or "No URL found"
-            self.url_labels[i].configure(text=display_prefix + display_url)
-
-            # Update tooltip with all candidates
-            if all_candidates:
-                tooltip_text = f"All matches for '{clean_base}':\n"
-                for idx, (title, url) in enumerate(all_candidates, 1):
-                    tooltip_text += f"{idx}. {title}\n   {url}\n"
-                self.url_tooltips[i].update_text(tooltip_text.strip())
-            else:
-                self.url_tooltips[i].update_text("No matching URLs found")
+        # Truncate clean_base to 76 chars + "…" if it’s over 76
+        if len(clean_base) > 76:
+            clean_base_trunc = clean_base[:74] + "..."
+        else:
+            clean_base_trunc = clean_base
+        diff_text = f"{clean_base_trunc}\n{candidate_title_trunc}"
+
+        title_hit_val = len(all_candidates)
+        display_prefix = f"({title_hit_val}) " if title_hit_val else ""
+        display_url = candidate_url or "No URL found"
+        url_text = display_prefix + display_url
+
+        # Tooltip lists all candidates
+        if all_candidates:
+            tooltip_text = f"All matches for '{clean_base}':\n"
+            for idx, (title, url) in enumerate(all_candidates, 1):
+                tooltip_text += f"{idx}. {title}\n   {url}\n"
+            tooltip_text = tooltip_text.strip()
+        else:
+            tooltip_text = "No matching URLs found"
 
-            # Get threshold value from UI control
-            try:
-                value_str = self.threshold_var.get().strip()
-                # Handle blank or negative values
-                if value_str == "" or value_str is None:
+        return scene_text, diff_text, url_text, tooltip_text, all_candidates
+
+    def _apply_candidate_rows(self, generation, resolved):
+        if generation != self._candidate_generation:
+            return
+        self._candidates_pending = False
+        if not self._scenes_widgets_ready():
+            logger.info("Skipping scene row refresh because Scenes widgets are unavailable.")
+            return
+
+        # Get threshold value from UI control
+        try:
+            value_str = self.threshold_var.get().strip()
+            # Handle blank or negative values
+            if value_str == "" or value_str is None:
+                threshold = 0
+            else:
+                threshold = int(value_str)
+                if threshold < 0:
                     threshold = 0
-                else:
-                    threshold = int(value_str)
-                    if threshold < 0:
-                        threshold = 0
-            except (ValueError, AttributeError):
-                threshold = 3  # Default fallback
+        except (ValueError, AttributeError):
+            threshold = 3  # Default fallback
+
+        # Loop-invariant lookups bound once; the candidate list is published
+        # in one assignment after every row is written.
+        get_scene_row = self._get_scene_row
+        scene_url_candidates = []
+        # Rows left over from a larger earlier batch are reset, not destroyed.
+        for i in range(max(len(resolved), len(self.scene_rows))):
+            row = get_scene_row(i)
+            if i >= len(resolved):
+                row.set_text("scene_label", "Scene NA")
+                row.set_text("diff_label", "N/A\nN/A")
+                row.set_text("url_label", "No URL")
+                row.set_checked(False)
+                row.tooltip.update_text("No URLs available")
+                scene_url_candidates.append([])
+                continue
+
+            scene_text, diff_text, url_text, tooltip_text, all_candidates = resolved[i]
+            # Store all candidates for this scene
+            scene_url_candidates.append(all_candidates)
+
+            row.set_text("scene_label", scene_text)
+            row.set_text("diff_label", diff_text)
+            row.set_text("url_label", url_text)
+            row.tooltip.update_text(tooltip_text)
 
             # Threshold logic:
             # - threshold = 0: Auto-check all scenes (no filtering)
             # - threshold > 0: Auto-check only if hit count < threshold
+            title_hit_val = len(all_candidates)
             if threshold == 0:
                 should_check = True  # Check all when threshold is 0
             else:
                 should_check = not (title_hit_val and title_hit_val >= threshold)
 
-            self.checkbox_vars[i].set(should_check)
+            row.set_checked(should_check)
+
+        self.scene_url_candidates = scene_url_candidates
 
     def clean_filename(self, filename_to_clean: str) -> str:
-        if filename_to_clean.lower().endswith(".mp4"):
-            filename_to_clean = filename_to_clean[:-4]
+        return clean_filename(filename_to_clean)
+
+    def _get_history_conn(self, db_path):
+        """Return the shared read-only history connection, opening it on first use.
+
+        Callers must hold ``_history_conn_lock``. Anything that writes
+        browserHistory.db must call ``_close_history_conn`` first. The file is
+        not opened with ``immutable=1`` because background syncs can rewrite it
+        while the GUI is running.
+        """
+        if self._history_conn is None:
+            self._ensure_historytitle_index(db_path)
+            conn = sqlite3.connect(
+                f"file:{db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+            conn.execute("PRAGMA query_only=1")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # Map up to 1 GiB so page reads skip read() syscalls; SQLite only
+            # maps as much as the file actually holds.
+            conn.execute("PRAGMA mmap_size=1073741824")
+            self._history_conn = conn
+        return self._history_conn
+
+    def _ensure_historytitle_index(self, db_path):
+        """Build the historytitle index on databases created before it existed."""
+        conn = None
+        try:
+            conn = sqlite3.connect(db_path)
+            has_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' AND name=?",
+                (HISTORYTITLE_INDEX_NAME,),
+            ).fetchone()
+            if not has_index:
+                logger.info("Indexing browser history titles for faster lookups...")
+                conn.execute(HISTORYTITLE_INDEX_SQL)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not index browser history titles: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def _close_history_conn(self, clear_cache=True):
+        """Close the shared history connection so writers get exclusive access.
 
-        filename_to_clean = remove_dash_number_suffix(filename_to_clean)
-        return sanitize_for_windows(filename_to_clean)
+        Lookups that hit an error only drop the connection; the database did
+        not change, so the memo and its epoch stay as they are.
+        """
+        if clear_cache:
+            self._clear_browser_url_cache()
+        with self._history_conn_lock:
+            if self._history_conn is None:
+                return
+            try:
+                self._history_conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing browser history connection: {e}")
+            self._history_conn = None
+
+    def _clear_browser_url_cache(self):
+        with self._history_conn_lock:
+            self._browser_url_cache_epoch += 1
+            self._browser_url_cache.clear()
+
+    def _store_browser_urls(self, epoch, entries):
+        # Drop results of lookups that started before the memo was last cleared.
+        with self._history_conn_lock:
+            if epoch != self._browser_url_cache_epoch:
+                return
+            if len(self._browser_url_cache) + len(entries) > BROWSER_URL_CACHE_MAX:
+                self._browser_url_cache.clear()
+            self._browser_url_cache.update(entries)
 
     def get_browser_urls(self, base_filename, get_all=False):
         clean_base = self.clean_filename(base_filename)
-
-        db_path = os.path.abspath("./browserHistory.db")
-        if not os.path.exists(db_path):
+        cache_key = (clean_base, get_all)
+        epoch = self._browser_url_cache_epoch
+        cached = self._browser_url_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        db_path = self.history_db_path
+        # An open lookup connection already implies the file exists.
+        if self._history_conn is None and not os.path.exists(db_path):
             return []
 
-        conn = None
-        try:
-            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-            cursor = conn.cursor()
+        filter_domains = self._browser_url_filter_domains()
 
-            sql_query = """
-            SELECT historytitle, url 
-            FROM browser_hist 
-            WHERE historytitle LIKE ? COLLATE NOCASE
-              AND LENGTH(historytitle) >= LENGTH(?)
-            """
-            param = clean_base + "%"
-            cursor.execute(sql_query, (param, clean_base))
-            results = cursor.fetchall()
+        try:
+            with self._history_conn_lock:
+                conn = self._get_history_conn(db_path)
+                candidates = _lookup_candidates(
+                    conn, clean_base, filter_domains, get_all
+                )
 
         except sqlite3.Error as e:
             logger.error(f"SQLite error for '{clean_base}' in {db_path}: {e}")
+            self._close_history_conn(clear_cache=False)
             return []
         except Exception as e:
             logger.error(f"General query error for '{clean_base}' in {db_path}: {e}")
             return []
-        finally:
-            if conn:
-                conn.close()
 
-        filter_domains = (
-            self.url_filters
-            if hasattr(self, "url_filters") and self.url_filters
-            else ["localhost", "google.com"]
-        )
+        self._store_browser_urls(epoch, {cache_key: candidates})
+        return candidates
+
+    def prefetch_browser_urls(self, base_filenames):
+        """Memoize the candidates for several filenames with a single query."""
+        epoch = self._browser_url_cache_epoch
+        clean_bases = []
+        for base_filename in base_filenames:
+            clean_base = self.clean_filename(base_filename)
+            if (
+                clean_base
+                and (clean_base, True) not in self._browser_url_cache
+                and clean_base not in clean_bases
+            ):
+                clean_bases.append(clean_base)
+        if not clean_bases:
+            return
 
-        filtered_results = [
-            (ht, u)
-            for (ht, u) in results
-            if u
-            and isinstance(u, str)
-            and all(d.lower() not in u.lower() for d in filter_domains)
-            and ht
-            and isinstance(ht, str)
-        ]
+        db_path = self.history_db_path
+        if self._history_conn is None and not os.path.exists(db_path):
+            return
 
-        if get_all:
-            # Apply the same startswith filtering for get_all=True
-            return [
-                (ht, u)
-                for (ht, u) in filtered_results
-                if ht.lower().startswith(clean_base.lower())
-            ]
+        filter_domains = self._browser_url_filter_domains()
 
-        for candidate_historytitle, candidate_url in filtered_results:
-            if candidate_historytitle.lower().startswith(clean_base.lower()):
-                return [(candidate_historytitle, candidate_url)]
+        try:
+            with self._history_conn_lock:
+                conn = self._get_history_conn(db_path)
+                candidates_by_base = _lookup_candidates_many(
+                    conn, clean_bases, filter_domains
+                )
+        except sqlite3.Error as e:
+            logger.error(f"SQLite error prefetching candidates in {db_path}: {e}")
+            self._close_history_conn(clear_cache=False)
+            return
 
-        if filtered_results:
-            return [filtered_results[0]]
+        entries = {}
+        for clean_base, candidates in candidates_by_base.items():
+            entries[(clean_base, True)] = candidates
+            entries[(clean_base, False)] = candidates[:1]
+        self._store_browser_urls(epoch, entries)
 
-        return []
+    def _browser_url_filter_domains(self):
+        return (
+            self.url_filters
+            if hasattr(self, "url_filters") and self.url_filters
+            else ["localhost", "google.com"]
+        )
 
     def accept_candidates(self):
+        if self.accept_in_progress:
+            # An accept is already queued or running.
+            return
+        if self._candidates_pending:
+            # Rows are still being filled in; accept what they will show.
+            # Holding accept_in_progress keeps the button disabled meanwhile.
+            self.set_accept_in_progress(True)
+            self.after(100, self._accept_when_candidates_ready)
+            return
+
         if not all([self.scheme_var.get(), self.host_var.get(), self.port_var.get()]):
             self.show_error_message(
                 "Missing Connection Details",
@@ -2911,58 +3435,64 @@ class UrlStashGUI(ctk.CTk):
         self.update_progress(0.0)
         threading.Thread(target=self._accept_candidates_thread, daemon=True).start()
 
+    def _accept_when_candidates_ready(self):
+        if self._candidates_pending:
+            self.after(100, self._accept_when_candidates_ready)
+            return
+        self.set_accept_in_progress(False)
+        self.accept_candidates()
+
     def _accept_candidates_thread(self):
         updated_scenes_count = 0
         last_updated_scene_id_for_config = ""
 
-        if not hasattr(self, "stash") or self.stash is None:
-            try:
-                self.stash = StashInterface(
-                    {
-                        "scheme": self.scheme_var.get(),
-                        "Host": self.host_var.get(),
-                        "Port": self.port_var.get(),
-                        "ApiKey": self.apikey_var.get(),
-                        "Logger": logger,
-                    }
-                )
-            except Exception as e:
-                logger.error(f"Error initializing Stash for accepting candidates: {e}")
-                error_msg = f"Stash connection failed: {str(e)}"
-                suggestions = "• Check that StashApp is running\n• Verify connection settings\n• Test connection first"
-                self.after(
-                    0,
-                    lambda: self.show_error_message(
-                        "Stash Connection Failed", error_msg, suggestions
-                    ),
-                )
-                def handle_accept_failure():
-                    self.set_accept_in_progress(False)
-                    self.set_connection_ready(False)
+        try:
+            self._get_stash()
+        except Exception as e:
+            logger.error(f"Error initializing Stash for accepting candidates: {e}")
+            error_msg = f"Stash connection failed: {str(e)}"
+            suggestions = "• Check that StashApp is running\n• Verify connection settings\n• Test connection first"
+            self.after(
+                0,
+                lambda: self.show_error_message(
+                    "Stash Connection Failed", error_msg, suggestions
+                ),
+            )
+            def handle_accept_failure():
+                self.set_accept_in_progress(False)
+                self.set_connection_ready(False)
 
-                self.after(0, handle_accept_failure)
-                return
+            self.after(0, handle_accept_failure)
+            return
 
         # Stash connection succeeded or already existed
         self.after(0, lambda: self.set_connection_ready(True))
 
         total_scenes = len(self.scenes)
+
+        # Fetch current data for every checked scene up front instead of one
+        # findScene request per scene; fall back to per-scene lookups on error.
+        checked_ids = [
+            str(self.scenes[i].get("id", ""))
+            for i in range(total_scenes)
+            if self.scenes[i].get("id")
+            and i < len(self.scene_rows)
+            and self.scene_rows[i].checkbox_var.get()
+        ]
+        try:
+            prefetched_scenes = self._batched_find_scenes(checked_ids)
+        except Exception as e:
+            logger.warning(f"Batched scene lookup failed, fetching individually: {e}")
+            prefetched_scenes = {}
+
+        # Decide every update first, then send the mutations concurrently.
+        pending_updates = []
         for i in range(total_scenes):
             if self.stop_event.is_set():
                 logger.info("Accept candidates thread: stop event detected.")
                 break
             self.pause_event.wait()
 
-            # Update progress
-            progress = i / total_scenes
-            self.after(0, lambda: self.update_progress(progress))
-            self.after(
-                0,
-                lambda: self.update_status(
-                    f"Updating URLs... {i}/{total_scenes} processed", "blue"
-                ),
-            )
-
             scene = self.scenes[i]
             scene_id_str = str(scene.get("id", ""))
 
@@ -2970,84 +3500,135 @@ class UrlStashGUI(ctk.CTk):
                 logger.warning(f"Scene at index {i} has no ID. Skipping.")
                 continue
 
-            if self.checkbox_vars[i].get():
-                selected_url = self.url_labels[i].cget("text")
-                selected_url = re.sub(r"^\(\d+\)\s+", "", selected_url)
-                if selected_url and selected_url.lower().startswith("http"):
-                    current_scene_data = self.stash.find_scene(scene_id_str)
-                    if not current_scene_data:
-                        logger.error(
-                            f"Scene {scene_id_str} not found in Stash during accept. Skipping."
-                        )
-                        continue
-
-                    existing_urls = current_scene_data.get("urls", [])
-                    if not isinstance(existing_urls, list):
-                        existing_urls = []
-
-                    url_already_exists = any(
-                        (isinstance(url_obj, str) and url_obj == selected_url)
-                        or (
-                            isinstance(url_obj, dict)
-                            and url_obj.get("url", "") == selected_url
-                        )
-                        for url_obj in existing_urls
-                    )
+            # Rows are rebuilt lazily, so a scene may not have one on screen.
+            if i >= len(self.scene_rows):
+                logger.info(f"Scene {scene_id_str}: No row displayed; skipping.")
+                continue
+            row = self.scene_rows[i]
+            if not row.checkbox_var.get():
+                logger.info(f"Scene {scene_id_str}: Checkbox not selected; skipping.")
+                continue
 
-                    if url_already_exists:
-                        logger.info(
-                            f"Scene {scene_id_str}: Candidate URL '{selected_url}' already exists in Stash; skipping update."
-                        )
-                        continue
+            selected_url = row.url_label.cget("text")
+            selected_url = HIT_COUNT_PREFIX_RE.sub("", selected_url)
+            if not selected_url or not selected_url.lower().startswith("http"):
+                logger.info(
+                    f"Scene {scene_id_str}: No valid URL selected or to update ('{selected_url}')."
+                )
+                continue
 
-                    updated_urls = existing_urls + [selected_url]
-                    try:
-                        tag = self.stash.find_tag("URLHistory", create=True)
-                        tag_ids_to_update = [tag["id"]] if tag and "id" in tag else []
-
-                        current_tags_in_stash = current_scene_data.get("tags", [])
-                        for t_stash in current_tags_in_stash:
-                            if (
-                                isinstance(t_stash, dict)
-                                and "id" in t_stash
-                                and t_stash["id"] not in tag_ids_to_update
-                            ):
-                                tag_ids_to_update.append(t_stash["id"])
+            try:
+                if scene_id_str in prefetched_scenes:
+                    current_scene_data = prefetched_scenes[scene_id_str]
+                else:
+                    current_scene_data = self.stash.find_scene(scene_id_str)
+            except Exception as e:
+                logger.error(f"Error retrieving scene {scene_id_str} from Stash: {e}")
+                continue
+            if not current_scene_data:
+                logger.error(
+                    f"Scene {scene_id_str} not found in Stash during accept. Skipping."
+                )
+                continue
 
-                        payload = {"id": scene_id_str, "urls": updated_urls}
-                        if tag_ids_to_update:
-                            payload["tag_ids"] = tag_ids_to_update
+            existing_urls = current_scene_data.get("urls", [])
+            if not isinstance(existing_urls, list):
+                existing_urls = []
 
-                        self.stash.update_scene(payload)
+            if selected_url in self._url_set(existing_urls):
+                logger.info(
+                    f"Scene {scene_id_str}: Candidate URL '{selected_url}' already exists in Stash; skipping update."
+                )
+                continue
 
-                        log_msg = (
-                            f"Scene {scene_id_str} Updated with URL: {selected_url}"
-                        )
-                        if tag_ids_to_update and (
-                            tag and "id" in tag and tag["id"] in tag_ids_to_update
-                        ):
-                            log_msg += " and tagged 'URLHistory'."
-
-                        self.log_text.after(
-                            0,
-                            lambda msg=log_msg, tag="update_complete": self._log_message_with_tag(
-                                msg, tag
+            tag_ids_to_update = []
+            for t_stash in current_scene_data.get("tags", []):
+                if (
+                    isinstance(t_stash, dict)
+                    and "id" in t_stash
+                    and t_stash["id"] not in tag_ids_to_update
+                ):
+                    tag_ids_to_update.append(t_stash["id"])
+
+            payload = {"id": scene_id_str, "urls": existing_urls + [selected_url]}
+            if tag_ids_to_update:
+                payload["tag_ids"] = tag_ids_to_update
+            pending_updates.append((i, scene_id_str, selected_url, payload))
+
+        # Look the tag up once before dispatching, and only when there is an
+        # update to send; concurrent create=True lookups could race to create
+        # it more than once.
+        tag_id = None
+        if pending_updates:
+            try:
+                tag_id = self._get_urlhistory_tag_id(self.stash)
+            except Exception as e:
+                logger.error(f"Error looking up 'URLHistory' tag in Stash: {e}")
+                for _, scene_id_str, _, _ in pending_updates:
+                    logger.error(
+                        f"Error updating scene {scene_id_str} in Stash: 'URLHistory' tag unavailable."
+                    )
+                pending_updates = []
+        if tag_id:
+            for _, _, _, payload in pending_updates:
+                payload["tag_ids"] = [tag_id] + [
+                    t_id for t_id in payload.get("tag_ids", []) if t_id != tag_id
+                ]
+
+        def send_update(update):
+            self.pause_event.wait()
+            if self.stop_event.is_set():
+                return None
+            self.stash.update_scene(update[3])
+            return update
+
+        completed_indices = []
+        if pending_updates:
+            with ThreadPoolExecutor(max_workers=STASH_FETCH_WORKERS) as executor:
+                futures = {
+                    executor.submit(send_update, update): update
+                    for update in pending_updates
+                }
+                for done_count, future in enumerate(as_completed(futures), 1):
+                    i, scene_id_str, selected_url, payload = futures[future]
+                    self.after(
+                        0,
+                        self._apply_scan_state,
+                        {
+                            "progress": done_count / len(pending_updates),
+                            "status": (
+                                f"Updating URLs... {done_count}/{len(pending_updates)} processed",
+                                "blue",
                             ),
-                        )
-                        updated_scenes_count += 1
-                        last_updated_scene_id_for_config = scene_id_str
+                        },
+                    )
+                    try:
+                        if future.result() is None:
+                            continue
                     except Exception as e:
                         logger.error(
                             f"Error updating scene {scene_id_str} in Stash: {e}",
                             exc_info=True,
                         )
-                else:
-                    logger.info(
-                        f"Scene {scene_id_str}: No valid URL selected or to update ('{selected_url}')."
+                        continue
+
+                    log_msg = f"Scene {scene_id_str} Updated with URL: {selected_url}"
+                    if tag_id and tag_id in payload.get("tag_ids", []):
+                        log_msg += " and tagged 'URLHistory'."
+                    self.log_text.after(
+                        0,
+                        lambda msg=log_msg, tag="update_complete": self._log_message_with_tag(
+                            msg, tag
+                        ),
                     )
-            else:
-                logger.info(f"Scene {scene_id_str}: Checkbox not selected; skipping.")
-            self.sleep_with_pause(0.05)
+                    completed_indices.append(i)
+
+        updated_scenes_count = len(completed_indices)
+        if completed_indices:
+            # Same as a sequential run: the last updated scene in display order
+            last_updated_scene_id_for_config = str(
+                self.scenes[max(completed_indices)].get("id", "")
+            )
 
         if last_updated_scene_id_for_config:
             self.after(
@@ -3102,8 +3683,8 @@ class UrlStashGUI(ctk.CTk):
         else:
             self.toggle_check_button.configure(text="Check All")
             self.update_status("All scenes deselected", "orange")
-        for checkbox_var in self.checkbox_vars:
-            checkbox_var.set(self.all_checked)
+        for row in self.scene_rows:
+            row.checkbox_var.set(self.all_checked)
 
     def increment_threshold(self):
         """Increment the auto-check threshold value"""
@@ -3202,17 +3783,39 @@ class UrlStashGUI(ctk.CTk):
             target=self._sync_scene_file_summary_thread, args=(file_path,), daemon=True
         ).start()
 
+    def _fetch_scenes_concurrently(self, stash, scene_ids):
+        """Fetch scenes by ID in parallel; a failed lookup maps to its exception."""
+
+        def fetch(scene_id):
+            try:
+                return stash.find_scene(scene_id)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=STASH_FETCH_WORKERS) as executor:
+            return dict(zip(scene_ids, executor.map(fetch, scene_ids)))
+
+    def _update_scenes_concurrently(self, stash, payloads):
+        """Send update_scene payloads in parallel; map each scene ID to its error or None."""
+
+        def update(payload):
+            try:
+                stash.update_scene(payload)
+            except Exception as e:
+                return e
+            return None
+
+        with ThreadPoolExecutor(max_workers=STASH_FETCH_WORKERS) as executor:
+            return dict(
+                zip(
+                    (payload["id"] for payload in payloads),
+                    executor.map(update, payloads),
+                )
+            )
+
     def _sync_scene_file_summary_thread(self, db_path):
         try:
-            local_stash = StashInterface(
-                {
-                    "scheme": self.scheme_var.get(),
-                    "Host": self.host_var.get(),
-                    "Port": self.port_var.get(),
-                    "ApiKey": self.apikey_var.get(),
-                    "Logger": logger,
-                }
-            )
+            local_stash = self._get_stash()
         except Exception as e:
             logger.error(f"Error connecting to Stash for side DB sync: {e}")
             self.after(
@@ -3263,59 +3866,96 @@ class UrlStashGUI(ctk.CTk):
 
         updated_count = 0
         processed_count = 0
-        for scene_id_from_db, url_from_db in rows:
+        # Looked up on the first update only, so a sync with nothing to do
+        # never creates the tag
+        tag_id = None
+        tag_looked_up = False
+        for window_start in range(0, len(rows), SYNC_PREFETCH_WINDOW):
             if self.stop_event.is_set():
                 logger.info("Side DB sync: stop event detected.")
                 break
             self.pause_event.wait()
 
-            processed_count += 1
-            scene_id_str = str(scene_id_from_db)
-
-            if not isinstance(url_from_db, str) or not url_from_db.lower().startswith(
-                "http"
-            ):
-                logger.info(
-                    f"Scene {scene_id_str}: URL '{url_from_db}' from side DB is not valid, skipping."
-                )
-                continue
+            # Fetch the scenes for this window of rows with aliased findScene
+            # requests; fall back to concurrent per-scene lookups on error.
+            window_rows = rows[window_start:window_start + SYNC_PREFETCH_WINDOW]
+            window_ids = sorted(
+                {
+                    str(window_scene_id)
+                    for window_scene_id, window_url in window_rows
+                    if isinstance(window_url, str)
+                    and window_url.lower().startswith("http")
+                }
+            )
             try:
-                scene_in_stash = local_stash.find_scene(scene_id_str)
+                scenes_in_window = self._batched_find_scenes(window_ids)
             except Exception as e:
-                logger.error(f"Error retrieving scene {scene_id_str} from Stash: {e}")
-                continue
-
-            if not scene_in_stash:
-                logger.info(
-                    f"Scene {scene_id_str} not found in Stash; skipping sync for this entry."
+                logger.warning(f"Batched scene lookup failed, fetching individually: {e}")
+                scenes_in_window = self._fetch_scenes_concurrently(
+                    local_stash, window_ids
                 )
-                continue
 
-            existing_urls_in_stash = scene_in_stash.get("urls", [])
-            if not isinstance(existing_urls_in_stash, list):
-                existing_urls_in_stash = []
+            # Decide the window's updates first; rows for the same scene are
+            # merged into one payload, then the mutations are sent concurrently.
+            scenes_to_update = {}
+            for scene_id_from_db, url_from_db in window_rows:
+                processed_count += 1
+                scene_id_str = str(scene_id_from_db)
 
-            url_already_exists_in_stash = any(
-                (isinstance(url_obj, dict) and url_obj.get("url", "") == url_from_db)
-                or (isinstance(url_obj, str) and url_obj == url_from_db)
-                for url_obj in existing_urls_in_stash
-            )
+                if not isinstance(url_from_db, str) or not url_from_db.lower().startswith(
+                    "http"
+                ):
+                    logger.info(
+                        f"Scene {scene_id_str}: URL '{url_from_db}' from side DB is not valid, skipping."
+                    )
+                    continue
+                scene_in_stash = scenes_in_window.get(scene_id_str)
+                if isinstance(scene_in_stash, Exception):
+                    logger.error(
+                        f"Error retrieving scene {scene_id_str} from Stash: {scene_in_stash}"
+                    )
+                    continue
+
+                if not scene_in_stash:
+                    logger.info(
+                        f"Scene {scene_id_str} not found in Stash; skipping sync for this entry."
+                    )
+                    continue
+
+                existing_urls_in_stash = scene_in_stash.get("urls", [])
+                if not isinstance(existing_urls_in_stash, list):
+                    existing_urls_in_stash = []
+
+                if url_from_db in self._url_set(existing_urls_in_stash):
+                    logger.info(
+                        f"Scene {scene_id_str}: URL '{url_from_db}' from side DB already exists in Stash; skipping."
+                    )
+                    continue
 
-            if url_already_exists_in_stash:
                 logger.info(
-                    f"Scene {scene_id_str}: URL '{url_from_db}' from side DB already exists in Stash; skipping."
+                    f"Scene {scene_id_str}: Syncing URL from side DB: {url_from_db}"
                 )
+                # Later rows for the same scene must build on this URL list
+                scene_in_stash["urls"] = existing_urls_in_stash + [url_from_db]
+                scenes_to_update[scene_id_str] = scene_in_stash
+
+            if not scenes_to_update:
                 continue
 
-            logger.info(
-                f"Scene {scene_id_str}: Syncing URL from side DB: {url_from_db}"
-            )
-            try:
-                tag = local_stash.find_tag("URLHistory", create=True)
-                tag_ids_to_update = [tag["id"]] if tag and "id" in tag else []
+            if not tag_looked_up:
+                try:
+                    tag_id = self._get_urlhistory_tag_id(local_stash)
+                    tag_looked_up = True
+                except Exception as e:
+                    logger.error(
+                        f"Error looking up 'URLHistory' tag in Stash; skipping {len(scenes_to_update)} scene update(s): {e}"
+                    )
+                    continue
 
-                current_tags_in_stash = scene_in_stash.get("tags", [])
-                for t_stash in current_tags_in_stash:
+            payloads = []
+            for scene_id_str, scene_in_stash in scenes_to_update.items():
+                tag_ids_to_update = [tag_id] if tag_id else []
+                for t_stash in scene_in_stash.get("tags", []):
                     if (
                         isinstance(t_stash, dict)
                         and "id" in t_stash
@@ -3323,19 +3963,20 @@ class UrlStashGUI(ctk.CTk):
                     ):
                         tag_ids_to_update.append(t_stash["id"])
 
-                new_urls_list_for_stash = existing_urls_in_stash + [url_from_db]
-                payload = {"id": scene_id_str, "urls": new_urls_list_for_stash}
+                payload = {"id": scene_id_str, "urls": scene_in_stash["urls"]}
                 if tag_ids_to_update:
                     payload["tag_ids"] = tag_ids_to_update
+                payloads.append(payload)
 
-                local_stash.update_scene(payload)
-                updated_count += 1
-            except Exception as e:
-                logger.error(
-                    f"Error updating scene {scene_id_str} in Stash with URL from side DB: {e}",
-                    exc_info=True,
-                )
-            self.sleep_with_pause(0.05)
+            results = self._update_scenes_concurrently(local_stash, payloads)
+            for scene_id_str, error in results.items():
+                if error is None:
+                    updated_count += 1
+                else:
+                    logger.error(
+                        f"Error updating scene {scene_id_str} in Stash with URL from side DB: {error}",
+                        exc_info=error,
+                    )
 
         final_message = f"Side DB Sync Complete. Processed {processed_count} rows. Synced URLs for {updated_count} scenes."
         logger.info(final_message)
@@ -5,25 +5,17 @@ import re
 import tkinter as tk
 
 
+# Quoted "apikey": "..." pairs (any case, so this also covers "ApiKey") and
+# free-text "API Key: ..." mentions.
+_QUOTED_APIKEY_RE = re.compile(
+    r'([\'"]apikey[\'"]\s*:\s*[\'"])(.*?)([\'"])', re.IGNORECASE
+)
+_API_KEY_TEXT_RE = re.compile(r"(API Key\s*[:=]\s*)(.+)", re.IGNORECASE)
+
+
 def redact_sensitive_data(message: str) -> str:
-    redacted = message
-    redacted = re.sub(
-        r'([\'"]apikey[\'"]\s*:\s*[\'"])(.*?)([\'"])',
-        r"\1***\3",
-        redacted,
-        flags=re.IGNORECASE,
-    )
-    redacted = re.sub(
-        r'([\'"]ApiKey[\'"]\s*:\s*[\'"])(.*?)([\'"])',
-        r"\1***\3",
-        redacted,
-    )
-    redacted = re.sub(
-        r"(API Key\s*[:=]\s*)(.+)",
-        r"\1***",
-        redacted,
-        flags=re.IGNORECASE,
-    )
+    redacted = _QUOTED_APIKEY_RE.sub(r"\1***\3", message)
+    redacted = _API_KEY_TEXT_RE.sub(r"\1***", redacted)
     return redacted
 
 
@@ -51,9 +43,10 @@ class TextHandler(logging.Handler):
     Logging handler that writes log messages to a Tkinter Text widget.
     """
 
-    def __init__(self, text_widget):
+    def __init__(self, text_widget, max_lines=5000):
         super().__init__()
         self.text_widget = text_widget
+        self.max_lines = max_lines
         self.pending_messages = queue.SimpleQueue()
         self._polling_started = False
 
@@ -85,18 +78,48 @@ class TextHandler(logging.Handler):
             return
 
         self.text_widget.configure(state="normal")
+        # Insert consecutive messages that share a tag as one string.
+        run_tag = None
+        run = []
         for msg in messages:
-            # Tag [JSON] messages as dark green.
-            if "[JSON]" in msg:
-                self.text_widget.insert(tk.END, msg, "update_complete")
-            # Tag [FILE ERROR] messages as dark red.
-            elif "[FILE ERROR]" in msg:
-                self.text_widget.insert(tk.END, msg, "file_error")
-            elif "Match found" in msg:
-                self.text_widget.insert(tk.END, msg, "match_found")
-            elif "Update complete" in msg:
-                self.text_widget.insert(tk.END, msg, "update_complete")
-            else:
-                self.text_widget.insert(tk.END, msg)
+            tag = self._tag_for(msg)
+            if run and tag != run_tag:
+                self._insert_run(run, run_tag)
+                run = []
+            run_tag = tag
+            run.append(msg)
+        self._insert_run(run, run_tag)
+        self._trim_to_max_lines()
         self.text_widget.configure(state="disabled")
         self.text_widget.yview(tk.END)
+
+    @staticmethod
+    def _tag_for(msg):
+        # Tag [JSON] messages as dark green.
+        if "[JSON]" in msg:
+            return "update_complete"
+        # Tag [FILE ERROR] messages as dark red.
+        if "[FILE ERROR]" in msg:
+            return "file_error"
+        if "Match found" in msg:
+            return "match_found"
+        if "Update complete" in msg:
+            return "update_complete"
+        return None
+
+    def _insert_run(self, run, tag):
+        if not run:
+            return
+        if tag:
+            self.text_widget.insert(tk.END, "".join(run), tag)
+        else:
+            self.text_widget.insert(tk.END, "".join(run))
+
+    def _trim_to_max_lines(self):
+        # Drop the oldest lines so long scans don't grow the widget without bound.
+        if not self.max_lines:
+            return
+        line_count = int(self.text_widget.index("end-1c").split(".")[0])
+        overflow = line_count - self.max_lines
+        if overflow > 0:
+            self.text_widget.delete("1.0", f"{overflow + 1}.0")
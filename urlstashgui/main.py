@@ -30,6 +30,7 @@ if __name__ == "__main__":
         processed_any = False
         total_rows_appended = 0
         processed_source_count = 0
+        history_sync_claimed = False
 
         # Temporarily suppress message boxes during auto-run
         original_showinfo = messagebox.showinfo
@@ -46,7 +47,12 @@ if __name__ == "__main__":
                     "No history paths are configured. Skipping auto-initialization."
                 )
             # return
+            elif not app._begin_history_sync():
+                summary_lines.append(
+                    "A browser history sync is already running. Skipping auto-initialization."
+                )
             else:
+                history_sync_claimed = True
                 summary_lines.append(
                     f"Found {len(app.userbrowserhistory)} browser history path(s) to process."
                 )
@@ -91,7 +97,7 @@ if __name__ == "__main__":
                             exc_info=True,
                         )
 
-                if processed_source_count > 0 and os.path.exists("browserHistory.db"):
+                if processed_source_count > 0 and os.path.exists(app.history_db_path):
                     if app._should_run_browser_history_maintenance(total_rows_appended):
                         summary_lines.append(
                             "Running batched dedupe/clean after all auto-start history files were appended."
@@ -120,6 +126,8 @@ if __name__ == "__main__":
             local_logger.error(f"[JSON] Auto initialization failed: {e}", exc_info=True)
             local_logger.info("\n".join(summary_lines))
         finally:
+            if history_sync_claimed:
+                app._end_history_sync()
             messagebox.showinfo = original_showinfo  # type: ignore
             messagebox.showerror = original_showerror  # type: ignore
             messagebox.showwarning = original_showwarning  # type: ignore
@@ -1,12 +1,50 @@
 # utils.py
+import os
 import re
+import string
+from functools import lru_cache
 
+# Anything str.isalnum() rejects: non-word characters plus the underscore.
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+# ASCII fast path for the same filter: delete non-alphanumeric bytes, lowercase the rest.
+_ASCII_NON_ALNUM = bytes(
+    b for b in range(128) if chr(b) not in string.ascii_letters + string.digits
+)
+_ASCII_LOWER = bytes.maketrans(
+    string.ascii_uppercase.encode("ascii"), string.ascii_lowercase.encode("ascii")
+)
 
+
+@lru_cache(maxsize=8192)
 def sanitize_for_windows(filename: str) -> str:
     # Removes non-alphanumeric characters and converts to lowercase.
-    return "".join(ch for ch in filename if ch.isalnum()).lower()
+    if filename.isascii():
+        return (
+            filename.encode("ascii")
+            .translate(_ASCII_LOWER, _ASCII_NON_ALNUM)
+            .decode("ascii")
+        )
+    return _NON_ALNUM_RE.sub("", filename).lower()
 
 
 def remove_dash_number_suffix(text: str) -> str:
-    # Removes a trailing dash with exactly two digits.
-    return re.sub(r"-\d\d$", "", text) if text else ""
+    # Removes a trailing dash with exactly two digits, e.g. "-01".
+    if not text:
+        return ""
+    if len(text) >= 3 and text[-3] == "-" and text[-2:].isdecimal():
+        return text[:-3]
+    return text
+
+
+@lru_cache(maxsize=4096)
+def clean_filename(filename: str) -> str:
+    # Scene filename -> the sanitized key stored in browser_hist.historytitle.
+    if filename.lower().endswith(".mp4"):
+        filename = filename[:-4]
+    return sanitize_for_windows(remove_dash_number_suffix(filename))
+
+
+@lru_cache(maxsize=4096)
+def scene_file_stem(path: str) -> str:
+    # File name without directory or extension, e.g. "/videos/a-01.mp4" -> "a-01".
+    return os.path.splitext(os.path.basename(path))[0]